@@ -5,7 +5,6 @@ HTMLnoJS Demo - Simple demonstration
 import asyncio
 import sys
 import signal
-import time
 from pathlib import Path
 
 # Add the package to Python path for development
@@ -18,7 +17,7 @@ async def main():
     app = htmlnojs("./go-server/debug", verbose=True)
     await app.start()
     # Keep running until interrupted
-    while True: time.sleep(1)
+    await app.wait_for_interrupt()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
@@ -1,4 +1,22 @@
 # contact.py - Fixed handlers
+import html
+from string import Template
+
+_SUCCESS_TPL = Template('''
+        <div class="alert alert-success">
+            <strong>Thank you, $name!</strong><br>
+            Your message has been received. We'll get back to you at $email soon!<br>
+            <small>✅ Message sent successfully via HTMLnoJS</small>
+        </div>
+        ''')
+
+_ERROR_TPL = Template('''
+        <div class="alert alert-error">
+            <strong>Error:</strong> $error
+        </div>
+        ''')
+
+
 def htmx_send(request):
     """
     Handle contact form submission
@@ -18,16 +36,6 @@ def htmx_send(request):
         if '@' not in email:
             return '<div class="alert alert-error"><strong>Error:</strong> Please enter a valid email!</div>'
 
-        return f'''
-        <div class="alert alert-success">
-            <strong>Thank you, {name}!</strong><br>
-            Your message has been received. We'll get back to you at {email} soon!<br>
-            <small>✅ Message sent successfully via HTMLnoJS</small>
-        </div>
-        '''
+        return _SUCCESS_TPL.substitute(name=html.escape(name), email=html.escape(email))
     except Exception as e:
-        return f'''
-        <div class="alert alert-error">
-            <strong>Error:</strong> {str(e)}
-        </div>
-        '''
\ No newline at end of file
+        return _ERROR_TPL.substitute(error=html.escape(str(e)))
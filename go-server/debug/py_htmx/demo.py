@@ -1,4 +1,17 @@
 # demo.py - Debug version
+import html
+from string import Template
+
+_FORM_TPL = Template('''
+    <div class="alert alert-info">
+        <strong>Form Submitted Successfully!</strong><br>
+        Your message: "$message"<br>
+        <small>Processed by Python backend via HTMX</small><br>
+        <small>Debug info: Request type was $request_type</small>
+    </div>
+    ''')
+
+
 def htmx_hello(request):
     """Simple hello world HTMX handler"""
     return '''
@@ -45,11 +58,4 @@ def htmx_form(request):
     if not message:
         message = 'No message provided (DEBUG MODE)'
 
-    return f'''
-    <div class="alert alert-info">
-        <strong>Form Submitted Successfully!</strong><br>
-        Your message: "{message}"<br>
-        <small>Processed by Python backend via HTMX</small><br>
-        <small>Debug info: Request type was {type(request)}</small>
-    </div>
-    '''
\ No newline at end of file
+    return _FORM_TPL.substitute(message=html.escape(str(message)), request_type=html.escape(str(type(request))))
@@ -1,4 +1,17 @@
 # utils.py - Fixed handlers
+import html
+from string import Template
+
+_TIME_TPL = Template('<span class="timestamp">$text</span>')
+
+_INFO_TPL = Template('''
+        <div class="info-box">
+            <strong>$label</strong><br>
+            $body
+        </div>
+        ''')
+
+
 def htmx_current_time(request):
     """
     Returns current server time
@@ -6,9 +19,9 @@ def htmx_current_time(request):
     try:
         from datetime import datetime
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return f'<span class="timestamp">Server time: {now}</span>'
+        return _TIME_TPL.substitute(text=f"Server time: {now}")
     except Exception as e:
-        return f'<span class="timestamp">Error: {str(e)}</span>'
+        return _TIME_TPL.substitute(text=html.escape(f"Error: {e}"))
 
 def htmx_user_agent(request):
     """
@@ -19,17 +32,8 @@ def htmx_user_agent(request):
         if hasattr(request, 'headers'):
             user_agent = request.headers.get('user-agent', 'Unknown')
         else:
-            user_agent = request.get('HTTP_USER_AGENT', 'Unknown')
+            user_agent = request.get('_headers', {}).get('HTTP_USER_AGENT', 'Unknown')
 
-        return f'''
-        <div class="info-box">
-            <strong>Your Browser:</strong><br>
-            <code>{user_agent}</code>
-        </div>
-        '''
+        return _INFO_TPL.substitute(label="Your Browser:", body=f"<code>{html.escape(user_agent)}</code>")
     except Exception as e:
-        return f'''
-        <div class="info-box">
-            <strong>Error:</strong> {str(e)}
-        </div>
-        '''
\ No newline at end of file
+        return _INFO_TPL.substitute(label="Error:", body=html.escape(str(e)))
@@ -5,6 +5,7 @@ import (
 	"log"
 	"path/filepath"
 	"os"
+	"strings"
 
 	"htmlnojs/routebuilder"
 	"htmlnojs/server"
@@ -15,6 +16,8 @@ func main() {
 	directory := flag.String("directory", ".", "Project directory to serve")
 	port := flag.Int("port", 8080, "Server port")
 	fastapiPort := flag.Int("fastapi-port", 8081, "FastAPI server port")
+	listenFD := flag.Int("listen-fd", -1, "Inherited file descriptor of a bound, listening socket to serve on")
+	corsOrigins := flag.String("cors-origins", "", "Comma-separated CORS origins (\"*\" for any); empty serves same-origin only")
 	flag.Parse()
 
 	log.SetOutput(os.Stdout)
@@ -52,10 +55,30 @@ func main() {
 		log.Fatal(err)
 	}
 
-	srv := server.Development().
+	var origins []string
+	for _, o := range strings.Split(*corsOrigins, ",") {
+		// "a, b" lists are common; a padded origin would never match a request's Origin header
+		if o = strings.TrimSpace(o); o != "" {
+			origins = append(origins, o)
+		}
+	}
+
+	// Origins must be set before WithRoutes, which wraps handlers with the current config
+	builder := server.Development().
 		Port(*port).
-		WithRoutes(routes).
-		Build()
+		AllowOrigins(origins...).
+		WithRoutes(routes)
+
+	if *listenFD >= 0 {
+		// The launcher reserved the port and kept it bound, so nothing can grab it in between
+		ln, err := server.ListenerFromFD(uintptr(*listenFD))
+		if err != nil {
+			log.Fatalf("Invalid -listen-fd %d: %v", *listenFD, err)
+		}
+		builder.WithListener(ln)
+	}
+
+	srv := builder.Build()
 
 	log.Printf("HTMLnoJS server starting at http://localhost:%d", *port)
 	log.Printf("FastAPI backend expected at http://localhost:%d", *fastapiPort)
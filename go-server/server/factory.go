@@ -1,6 +1,9 @@
 package server
 
 import (
+	"fmt"
+	"net"
+	"os"
 	"time"
 
 	"htmlnojs/routebuilder"
@@ -30,6 +33,22 @@ func (b *ServerBuilder) Port(port int) *ServerBuilder {
 	return b
 }
 
+// WithListener serves on an already-bound listener instead of binding host:port at Start
+func (b *ServerBuilder) WithListener(ln net.Listener) *ServerBuilder {
+	b.server.listener = ln
+	return b
+}
+
+// ListenerFromFD wraps an inherited, bound and listening socket descriptor for WithListener
+func ListenerFromFD(fd uintptr) (net.Listener, error) {
+	f := os.NewFile(fd, "listener")
+	if f == nil {
+		return nil, fmt.Errorf("invalid listener descriptor %d", fd)
+	}
+	defer f.Close()
+	return net.FileListener(f)
+}
+
 // WithRoutes sets the routes for the server
 func (b *ServerBuilder) WithRoutes(routes *routebuilder.RouteCollection) *ServerBuilder {
 	b.server.RegisterRoutes(routes)
@@ -51,6 +70,13 @@ func (b *ServerBuilder) EnableCORS(enable bool) *ServerBuilder {
 	return b
 }
 
+// AllowOrigins restricts CORS to the given origins ("*" allows any); no origins disables CORS entirely
+func (b *ServerBuilder) AllowOrigins(origins ...string) *ServerBuilder {
+	b.server.config.CORSOrigins = origins
+	b.server.config.EnableCORS = len(origins) > 0
+	return b
+}
+
 // EnableLogging enables or disables request logging
 func (b *ServerBuilder) EnableLogging(enable bool) *ServerBuilder {
 	b.server.config.EnableLogging = enable
@@ -4,6 +4,7 @@ import (
 	"context"
 	"fmt"
 	"log"
+	"net"
 	"net/http"
 	"os"
 	"os/signal"
@@ -21,6 +22,7 @@ type Server struct {
 	server         *http.Server
 	routes         *routebuilder.RouteCollection
 	middleware     []MiddlewareFunc
+	listener       net.Listener // pre-bound socket handed over by the launcher, if any
 	config         ServerConfig
 }
 
@@ -30,6 +32,7 @@ type ServerConfig struct {
 	IdleTimeout     time.Duration
 	ShutdownTimeout time.Duration
 	EnableCORS      bool
+	CORSOrigins     []string // allow-list; empty or "*" means any origin
 	EnableLogging   bool
 	EnableMetrics   bool
 }
@@ -282,10 +285,21 @@ func (s *Server) Start() error {
 	log.Printf("Server configuration:")
 	log.Printf("  - Read timeout: %v", s.config.ReadTimeout)
 	log.Printf("  - Write timeout: %v", s.config.WriteTimeout)
-	log.Printf("  - CORS enabled: %v", s.config.EnableCORS)
+	log.Printf("  - CORS enabled: %v %v", s.config.EnableCORS, s.config.CORSOrigins)
 	log.Printf("  - Logging enabled: %v", s.config.EnableLogging)
 
-	return s.server.ListenAndServe()
+	ln := s.listener
+	if ln == nil {
+		var err error
+		if ln, err = net.Listen("tcp", addr); err != nil {
+			return err
+		}
+	}
+
+	// Logged only once the socket is bound so launchers can treat it as a readiness signal
+	log.Printf("HTMLnoJS server listening on %s", ln.Addr())
+
+	return s.server.Serve(ln)
 }
 
 // StartWithGracefulShutdown starts the server with graceful shutdown handling
@@ -354,11 +368,54 @@ func (s *Server) authMiddleware(next http.HandlerFunc) http.HandlerFunc {
 	}
 }
 
+// Preflight header values never change; assigning the slices skips per-request canonicalisation
+var (
+	corsAllowMethods = []string{"GET, POST, PUT, DELETE, OPTIONS"}
+	corsAllowHeaders = []string{"Content-Type, Authorization"}
+)
+
+// corsOrigin returns a resolver from a request Origin to the Access-Control-Allow-Origin value ("" = omit)
+func (s *Server) corsOrigin() func(string) string {
+	allowed := make(map[string]struct{}, len(s.config.CORSOrigins))
+	for _, o := range s.config.CORSOrigins {
+		if o == "*" {
+			allowed = nil
+			break
+		}
+		allowed[o] = struct{}{}
+	}
+	if len(allowed) == 0 {
+		return func(string) string { return "*" }
+	}
+	return func(origin string) string {
+		if _, ok := allowed[origin]; ok {
+			return origin
+		}
+		return ""
+	}
+}
+
+// setCORSOrigin writes the allow-origin header for an allowed request and reports whether it did
+func setCORSOrigin(h http.Header, allow func(string) string, r *http.Request) bool {
+	origin := allow(r.Header.Get("Origin"))
+	if origin == "" {
+		return false
+	}
+	h.Set("Access-Control-Allow-Origin", origin)
+	if origin != "*" {
+		h.Add("Vary", "Origin")
+	}
+	return true
+}
+
 func (s *Server) corsMiddleware(next http.HandlerFunc) http.HandlerFunc {
+	allow := s.corsOrigin()
 	return func(w http.ResponseWriter, r *http.Request) {
-		w.Header().Set("Access-Control-Allow-Origin", "*")
-		w.Header().Set("Access-Control-Allow-Methods", "GET, POST, PUT, DELETE, OPTIONS")
-		w.Header().Set("Access-Control-Allow-Headers", "Content-Type, Authorization")
+		h := w.Header()
+		if setCORSOrigin(h, allow, r) {
+			h["Access-Control-Allow-Methods"] = corsAllowMethods
+			h["Access-Control-Allow-Headers"] = corsAllowHeaders
+		}
 
 		if r.Method == "OPTIONS" {
 			w.WriteHeader(http.StatusOK)
@@ -378,12 +435,16 @@ func (s *Server) staticMiddleware(next http.HandlerFunc) http.HandlerFunc {
 }
 
 func (s *Server) apiMiddleware(next http.HandlerFunc) http.HandlerFunc {
+	var allow func(string) string
+	if s.config.EnableCORS {
+		allow = s.corsOrigin()
+	}
 	return func(w http.ResponseWriter, r *http.Request) {
 		// Set API-specific headers
 		w.Header().Set("Content-Type", "text/html") // HTMX returns HTML fragments
 
-		if s.config.EnableCORS {
-			w.Header().Set("Access-Control-Allow-Origin", "*")
+		if allow != nil {
+			setCORSOrigin(w.Header(), allow, r)
 		}
 
 		next(w, r)
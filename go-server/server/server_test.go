@@ -0,0 +1,86 @@
+package server
+
+import (
+	"fmt"
+	"net"
+	"net/http"
+	"testing"
+
+	"htmlnojs/routebuilder"
+)
+
+func TestServeOnInheritedListener(t *testing.T) {
+	reserved, err := net.Listen("tcp", "127.0.0.1:0")
+	if err != nil {
+		t.Fatal(err)
+	}
+	f, err := reserved.(*net.TCPListener).File()
+	if err != nil {
+		t.Fatal(err)
+	}
+	addr := reserved.Addr().String()
+	// the launcher closes its copy once the child holds the descriptor
+	reserved.Close()
+
+	ln, err := ListenerFromFD(f.Fd())
+	if err != nil {
+		t.Fatal(err)
+	}
+	f.Close()
+
+	srv := Development().WithListener(ln).WithRoutes(&routebuilder.RouteCollection{}).Build()
+	go srv.Start()
+	defer srv.Stop()
+
+	resp, err := http.Get(fmt.Sprintf("http://%s/health", addr))
+	if err != nil {
+		t.Fatal(err)
+	}
+	resp.Body.Close()
+	if resp.StatusCode != http.StatusOK {
+		t.Fatalf("GET /health = %d, want 200", resp.StatusCode)
+	}
+}
+
+func TestListenerFromFDRejectsNonSocket(t *testing.T) {
+	if _, err := ListenerFromFD(^uintptr(0)); err == nil {
+		t.Fatal("expected an error for an invalid descriptor")
+	}
+}
+
+func TestCORSOriginAllowList(t *testing.T) {
+	srv := Development().AllowOrigins("http://a.test", "http://b.test").Build()
+	allow := srv.corsOrigin()
+	if got := allow("http://a.test"); got != "http://a.test" {
+		t.Fatalf("allowed origin -> %q", got)
+	}
+	if got := allow("http://evil.test"); got != "" {
+		t.Fatalf("foreign origin -> %q, want no header", got)
+	}
+	if srv.config.EnableCORS != true {
+		t.Fatal("an allow-list should enable CORS")
+	}
+}
+
+func TestCORSOriginWildcard(t *testing.T) {
+	allow := Development().AllowOrigins("http://a.test", "*").Build().corsOrigin()
+	if got := allow("http://any.test"); got != "*" {
+		t.Fatalf("wildcard -> %q", got)
+	}
+}
+
+func TestCORSOffWithoutOrigins(t *testing.T) {
+	if Development().AllowOrigins().Build().config.EnableCORS {
+		t.Fatal("no origins should disable CORS")
+	}
+}
+
+func TestSetCORSOriginVariesOnEcho(t *testing.T) {
+	allow := Development().AllowOrigins("http://a.test").Build().corsOrigin()
+	r, _ := http.NewRequest("GET", "/", nil)
+	r.Header.Set("Origin", "http://a.test")
+	h := http.Header{}
+	if !setCORSOrigin(h, allow, r) || h.Get("Access-Control-Allow-Origin") != "http://a.test" || h.Get("Vary") != "Origin" {
+		t.Fatalf("unexpected headers %v", h)
+	}
+}
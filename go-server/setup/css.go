@@ -2,6 +2,7 @@ package setup
 
 import (
 	"fmt"
+	"io/fs"
 	"log"
 	"os"
 	"path/filepath"
@@ -77,20 +78,25 @@ func (c *CSSValidator) provisionReadme() error {
 }
 
 func (c *CSSValidator) scanCSSFiles() error {
-	return filepath.Walk(c.config.CSSDir, func(path string, info os.FileInfo, err error) error {
+	return filepath.WalkDir(c.config.CSSDir, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return err
 		}
 
-		if info.IsDir() || !strings.HasSuffix(strings.ToLower(path), ".css") {
+		if d.IsDir() || !strings.HasSuffix(strings.ToLower(path), ".css") {
 			return nil
 		}
 
 		// Skip README files
-		if strings.Contains(strings.ToLower(info.Name()), "readme") {
+		if strings.Contains(strings.ToLower(d.Name()), "readme") {
 			return nil
 		}
 
+		// Only matching stylesheets need a stat, for their size
+		info, err := d.Info()
+		if err != nil {
+			return err
+		}
 		c.addCSSFile(path, info)
 		return nil
 	})
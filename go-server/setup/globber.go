@@ -1,6 +1,7 @@
 package setup
 
 import (
+	"os"
 	"path/filepath"
 )
 
@@ -14,26 +15,46 @@ type FileSet struct {
 func (c *Config) GlobFiles() (*FileSet, error) {
 	fs := &FileSet{}
 
-	// Glob all files in py_htmx directory
-	pyFiles, err := filepath.Glob(filepath.Join(c.PyHTMXDir, "*"))
+	// List all files in py_htmx directory
+	pyFiles, err := listFiles(c.PyHTMXDir)
 	if err != nil {
 		return nil, err
 	}
 	fs.PyHTMXFiles = pyFiles
 
-	// Glob all files in templates directory
-	templateFiles, err := filepath.Glob(filepath.Join(c.TemplatesDir, "*"))
+	// List all files in templates directory
+	templateFiles, err := listFiles(c.TemplatesDir)
 	if err != nil {
 		return nil, err
 	}
 	fs.TemplateFiles = templateFiles
 
-	// Glob all files in css directory
-	cssFiles, err := filepath.Glob(filepath.Join(c.CSSDir, "*"))
+	// List all files in css directory
+	cssFiles, err := listFiles(c.CSSDir)
 	if err != nil {
 		return nil, err
 	}
 	fs.CSSFiles = cssFiles
 
 	return fs, nil
-}
\ No newline at end of file
+}
+
+// listFiles returns the sorted, non-directory entries of dir from a single ReadDir.
+// Entry types come from the directory listing itself, so no file is stat'ed; a missing dir yields nothing.
+func listFiles(dir string) ([]string, error) {
+	entries, err := os.ReadDir(dir)
+	if err != nil {
+		if os.IsNotExist(err) {
+			return nil, nil
+		}
+		return nil, err
+	}
+
+	files := make([]string, 0, len(entries))
+	for _, entry := range entries {
+		if !entry.IsDir() {
+			files = append(files, filepath.Join(dir, entry.Name()))
+		}
+	}
+	return files, nil
+}
@@ -70,20 +70,20 @@ func (h *HTMLValidator) provisionReadme() error {
 }
 
 func (h *HTMLValidator) scanTemplates() error {
-	files, err := filepath.Glob(filepath.Join(h.config.TemplatesDir, "*"))
+	entries, err := os.ReadDir(h.config.TemplatesDir)
 	if err != nil {
 		return fmt.Errorf("failed to scan templates directory: %w", err)
 	}
 
 	var invalidFiles []string
 
-	for _, file := range files {
-		info, err := os.Stat(file)
-		if err != nil || info.IsDir() {
+	for _, entry := range entries {
+		if entry.IsDir() {
 			continue
 		}
 
-		filename := filepath.Base(file)
+		filename := entry.Name()
+		file := filepath.Join(h.config.TemplatesDir, filename)
 		ext := strings.ToLower(filepath.Ext(filename))
 
 		if ext == ".html" || ext == ".htm" {
@@ -2,6 +2,7 @@ package setup
 
 import (
 	"fmt"
+	"io/fs"
 	"log"
 	"os"
 	"path/filepath"
@@ -71,21 +72,21 @@ func (p *PyHTMXValidator) provisionReadme() error {
 }
 
 func (p *PyHTMXValidator) scanPythonFiles() error {
-	return filepath.Walk(p.config.PyHTMXDir, func(path string, info os.FileInfo, err error) error {
+	return filepath.WalkDir(p.config.PyHTMXDir, func(path string, d fs.DirEntry, err error) error {
 		if err != nil {
 			return err
 		}
 
-		if info.IsDir() || !strings.HasSuffix(strings.ToLower(path), ".py") {
+		if d.IsDir() || !strings.HasSuffix(strings.ToLower(path), ".py") {
 			return nil
 		}
 
 		// Skip README files
-		if strings.Contains(strings.ToLower(info.Name()), "readme") {
+		if strings.Contains(strings.ToLower(d.Name()), "readme") {
 			return nil
 		}
 
-		p.addPythonHandler(path, info.Name())
+		p.addPythonHandler(path, d.Name())
 		return nil
 	})
 }
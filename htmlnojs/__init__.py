@@ -26,4 +26,15 @@ __all__ = [
     "HTMXServer",
     "PortManager",
     "InstanceRegistry",
-]
\ No newline at end of file
+
+    # Handler helpers
+    "htmx_sync_fast",
+]
+
+
+def __getattr__(name: str):
+    # handler helpers live beside the FastAPI app; resolve them lazily so `import htmlnojs` stays light
+    if name == "htmx_sync_fast":
+        from .htmx_app import htmx_sync_fast
+        return htmx_sync_fast
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -5,8 +5,9 @@ import uuid
 import signal
 import asyncio
 import atexit
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Sequence
 from dataclasses import dataclass
 
 from async_property import async_cached_property, async_property
@@ -24,7 +25,8 @@ class HTMLnoJS:
     Orchestrates Go server, Python HTMX server, and project management
     """
 
-    def __init__(self, project_dir: str = ".", port: int = 3000, alias: Optional[str] = None, verbose: Optional[bool] = False):
+    def __init__(self, project_dir: str = ".", port: int = 3000, alias: Optional[str] = None, verbose: Optional[bool] = False,
+                 cors_origins: Optional[Sequence[str]] = None):
         self.verbose = verbose
         self._shutdown_initiated = False
 
@@ -32,12 +34,15 @@ class HTMLnoJS:
         self.project_dir = Path(project_dir).resolve()
 
         self.port_manager = PortManager()
-        self.go_port, self.python_port = self.port_manager.allocate_port_pair(port)
+        # keep both ports bound until each server takes its socket over
+        (self.go_port, go_sock), (self.python_port, python_sock) = self.port_manager.reserve_port_pair(port)
         if verbose: log.debug(f"{self}: Initialized ports:\ngo_port={self.go_port}\npython_port={self.python_port}")
 
         python_url = f"http://localhost:{self.python_port}"
 
-        self.go_server = GoServer(str(self.project_dir), self.go_port, self.python_port)
+        self.go_server = GoServer(
+            str(self.project_dir), self.go_port, self.python_port, listener=go_sock, cors_origins=cors_origins
+        )
         self.go_server.verbose = verbose
 
         self.htmx_server = HTMXServer(
@@ -45,7 +50,8 @@ class HTMLnoJS:
             port=self.python_port,
             go_port=self.go_port,         # ← your real Go server port
             host="127.0.0.1",             # or localhost, whatever your host is
-            verbose=self.verbose
+            verbose=self.verbose,
+            sock=python_sock
         )
 
         InstanceRegistry.register(self)
@@ -66,16 +72,14 @@ class HTMLnoJS:
                 self._shutdown_initiated = True
                 # Run cleanup in a new event loop if needed
                 try:
-                    loop = asyncio.get_event_loop()
-                    if loop.is_running():
-                        # Schedule the cleanup
-                        asyncio.create_task(self.stop())
-                    else:
-                        # Run cleanup directly
+                    try:
+                        loop = asyncio.get_running_loop()
+                    except RuntimeError:
+                        # No event loop running, run cleanup directly
                         asyncio.run(self.stop())
-                except RuntimeError:
-                    # No event loop running, create one
-                    asyncio.run(self.stop())
+                    else:
+                        # Schedule the cleanup
+                        loop.create_task(self.stop())
                 except Exception as e:
                     log.error(f"{self}: Error during signal cleanup: {e}")
                     self._cleanup_sync()
@@ -115,8 +119,8 @@ class HTMLnoJS:
 
         try:
             log.info(f"{self}: Starting servers...")
-            await self.go_server.is_running()
-            await self.htmx_server.is_running()
+            await self._prepare()
+            await self._launch()
             log.success(f"{self}: All servers started successfully!")
             return True
         except Exception as e:
@@ -124,6 +128,41 @@ class HTMLnoJS:
             await self.stop()
             return False
 
+    async def _prepare(self):
+        """Pre-launch dependency checks; they're independent, so they run concurrently off the event loop"""
+        project_ok, go_ok, launcher_ok = await asyncio.gather(
+            asyncio.to_thread(self.project_dir.is_dir),
+            asyncio.to_thread(self.go_server.check_go_available),
+            asyncio.to_thread(self.go_server.launcher_path.exists),
+        )
+        if not project_ok:
+            raise FileNotFoundError(f"Project directory not found: {self.project_dir}")
+        if not go_ok and not launcher_ok:
+            raise RuntimeError(f"Go toolchain not on PATH and launcher missing at {self.go_server.launcher_path}")
+        if self.verbose: log.debug(f"{self}: dependencies ok (go on PATH={go_ok}, launcher={launcher_ok})")
+
+    async def _launch(self):
+        """Launch Go and HTMX servers concurrently, then fan-in their health checks"""
+        servers = (self.go_server, self.htmx_server)
+        results = await asyncio.gather(*(server.start() for server in servers), return_exceptions=True)
+
+        # Whichever components did come up get unwound if a sibling failed
+        async with AsyncExitStack() as stack:
+            for server, result in zip(servers, results):
+                if not isinstance(result, BaseException):
+                    stack.push_async_exit(server)
+
+            failures = [result for result in results if isinstance(result, BaseException)]
+            if failures:
+                raise failures[0]
+            stack.pop_all()
+
+        go_ok, htmx_ok = await asyncio.gather(self.go_server.is_running(), self.htmx_server.is_running())
+        if not go_ok:
+            log.warning(f"{self}: Go server not healthy yet at {self.go_server.url}")
+        if not htmx_ok:
+            log.warning(f"{self}: HTMX server not healthy yet at {self.htmx_server.url}")
+
     async def stop(self):
         """Stop all servers"""
         if self._shutdown_initiated:
@@ -207,7 +246,8 @@ class HTMLnoJS:
 
 
 # Factory function - main API entry point
-def htmlnojs(project_dir: str = ".", port: int = 3000, alias: Optional[str] = None, verbose: Optional[bool] = False) -> HTMLnoJS:
+def htmlnojs(project_dir: str = ".", port: int = 3000, alias: Optional[str] = None, verbose: Optional[bool] = False,
+             cors_origins: Optional[Sequence[str]] = None) -> HTMLnoJS:
     """
     Create HTMLnoJS application instance
 
@@ -218,7 +258,7 @@ def htmlnojs(project_dir: str = ".", port: int = 3000, alias: Optional[str] = No
         # Or run forever
         app.run_forever()
     """
-    return HTMLnoJS(project_dir, port, alias, verbose)
+    return HTMLnoJS(project_dir, port, alias, verbose, cors_origins)
 
 
 # Convenience functions
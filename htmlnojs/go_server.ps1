@@ -1,7 +1,8 @@
 param (
     [string]$Project     = ".",
     [int]   $Port        = 3000,
-    [int]   $FastAPIPort = 3001
+    [int]   $FastAPIPort = 3001,
+    [string]$CORSOrigins = ""
 )
 
 $ErrorActionPreference = "Stop"
@@ -97,11 +98,12 @@ Write-Host "Found main.go at: $mainGo" -ForegroundColor Green
 
 Push-Location $goServerDir
 try {
-    Write-Host "Running: go run main.go -directory `"$Project`" -port $Port -fastapi-port $FastAPIPort" -ForegroundColor Yellow
-    go run main.go `
-        -directory "$Project" `
-        -port $Port `
-        -fastapi-port $FastAPIPort
+    $goArgs = @("-directory", $Project, "-port", $Port, "-fastapi-port", $FastAPIPort)
+    if ($CORSOrigins) {
+        $goArgs += @("-cors-origins", $CORSOrigins)
+    }
+    Write-Host "Running: go run main.go $goArgs" -ForegroundColor Yellow
+    go run main.go @goArgs
 } catch {
     Write-Error "Failed to start Go server: $_"
     exit 1
@@ -1,24 +1,78 @@
 import asyncio
+import hashlib
+import os
+import re
+import shutil
+import socket
 import subprocess
 import threading
 import time
+from collections import deque
+from functools import cached_property, lru_cache
 from pathlib import Path
-from typing import Optional
+from stat import S_ISREG
+from typing import Optional, Callable, Dict, List, Sequence, Tuple
+
 from loguru import logger as log
-from propcache import cached_property
+
+from .polling import http_get, poll_until
+
+
+# Built server binaries and their source stamps
+_CACHE_DIR = Path.home() / ".cache" / "htmlnojs"
+
+
+_EMBED_RE = re.compile(rb"^//go:embed\s+(.+)$", re.MULTILINE)
+
+
+@lru_cache(maxsize=None)
+def _which_go() -> Optional[str]:
+    return shutil.which("go")
+
+
+@lru_cache(maxsize=256)
+def _embed_patterns(path: Path, mtime_ns: int, size: int) -> Tuple[str, ...]:
+    """`//go:embed` patterns declared in a Go file; keyed by stat so only edited files are re-read"""
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return ()
+    patterns = []
+    for line in _EMBED_RE.findall(data):
+        for pattern in line.decode().split():
+            pattern = pattern.strip('"`')
+            patterns.append(pattern[4:] if pattern.startswith("all:") else pattern)
+    return tuple(patterns)
 
 
 class GoServer:
     """Manages Go server subprocess using a real threading.Thread"""
 
-    def __init__(self, project_dir: str, port: int, python_port: int):
+    # (checked_at, `go version` output or None); the toolchain doesn't change under a running process
+    _go_version_cache: Optional[Tuple[float, Optional[str]]] = None
+    _GO_CACHE_TTL = 30.0
+
+    _build_lock = threading.Lock()
+    # go-server dir -> (source fingerprint, binary); later instances in this process skip the stamp and hash
+    # while the sources' stat fingerprint still matches
+    _binaries: Dict[Path, Tuple[str, Path]] = {}
+
+    def __init__(self, project_dir: str, port: int, python_port: int, listener: Optional[socket.socket] = None,
+                 cors_origins: Optional[Sequence[str]] = None):
         self.project_dir = Path(project_dir).resolve()
         self.port = port
         self.python_port = python_port
         self.verbose = False
+        # origins allowed cross-origin access ("*" for any); empty keeps the Go server same-origin only
+        self.cors_origins = tuple(cors_origins or ())
+        # reserved socket for `port`, inherited by the compiled server so the port is never left unbound
+        self._listener = listener
 
         self._popen: Optional[subprocess.Popen] = None
         self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listening: Optional[asyncio.Event] = None
+        self._exited: Optional[asyncio.Event] = None
 
     def __repr__(self):
         return f"[HTMLnoJS.GoServer]"
@@ -31,77 +85,338 @@ class GoServer:
     def launcher_path(self) -> Path:
         return Path(__file__).parent / "go_server.ps1"
 
+    @cached_property
+    def go_server_dir(self) -> Path:
+        """Directory holding main.go, resolved the same way as go_server.ps1"""
+        bundled = Path(__file__).parent.parent / "go-server"
+        return bundled if (bundled / "main.go").exists() else self.project_dir
+
+    @classmethod
+    def _probe_go(cls) -> Optional[str]:
+        """`go version` output, or None without a working toolchain; shared by every instance for _GO_CACHE_TTL"""
+        cached = cls._go_version_cache
+        if cached is not None and time.monotonic() - cached[0] < cls._GO_CACHE_TTL:
+            return cached[1]
+
+        _which_go.cache_clear()
+        go = _which_go()
+        version = None
+        if go:
+            try:
+                result = subprocess.run([go, "version"], capture_output=True, text=True, timeout=10)
+                if result.returncode == 0:
+                    version = result.stdout.strip()
+            except (OSError, subprocess.SubprocessError):
+                pass
+
+        cls._go_version_cache = (time.monotonic(), version)
+        return version
+
+    def check_go_available(self, strict: bool = False) -> bool:
+        """
+        Whether a Go toolchain is on PATH
+        strict=True also requires `go version` to succeed (cached process-wide, see _probe_go)
+        """
+        if strict:
+            version = self._probe_go()
+            if self.verbose:
+                log.debug(f"{self}: go toolchain -> {version}")
+            return version is not None
+
+        if _which_go():
+            # which() already proves the binary exists and is executable
+            return True
+        # don't pin a miss: Go may be installed while we're running
+        _which_go.cache_clear()
+        return False
+
+    @cached_property
+    def _location(self) -> str:
+        """Short hash of go_server_dir; namespaces its stamp and binaries in the shared cache dir"""
+        return hashlib.blake2b(str(self.go_server_dir).encode(), digest_size=8).hexdigest()
+
+    def _source_files(self) -> List[Tuple[Path, str, os.stat_result]]:
+        """Every input of `go build`: Go files, go.mod/go.sum and the assets their //go:embed lines pull in"""
+        src_dir = self.go_server_dir
+        go_files = list(src_dir.rglob("*.go"))
+        candidates = {*go_files, src_dir / "go.mod", src_dir / "go.sum"}
+        for f in go_files:
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            for pattern in _embed_patterns(f, st.st_mtime_ns, st.st_size):
+                for match in f.parent.glob(pattern):
+                    candidates.update(match.rglob("*") if match.is_dir() else (match,))
+
+        # one stat per candidate: it both filters out non-files and feeds the fingerprint
+        entries = []
+        for f in sorted(candidates):
+            try:
+                st = os.stat(f)
+            except OSError:
+                continue
+            if S_ISREG(st.st_mode):
+                entries.append((f, f.relative_to(src_dir).as_posix(), st))
+        return entries
+
+    @staticmethod
+    def _fingerprint(entries: List[Tuple[Path, str, os.stat_result]]) -> str:
+        """Stat fingerprint (path, mtime, size) of the source set"""
+        return hashlib.blake2b(
+            repr([(rel, st.st_mtime_ns, st.st_size) for _, rel, st in entries]).encode(), digest_size=16
+        ).hexdigest()
+
+    def _source_digest(self, entries: List[Tuple[Path, str, os.stat_result]], fingerprint: str) -> str:
+        """
+        Content hash of the go-server sources
+        A stamp file maps the stat fingerprint to the last digest, so unchanged trees aren't re-read
+        """
+        stamp = _CACHE_DIR / f"go-server-{self._location}.stamp"
+        try:
+            saved_fingerprint, saved_digest = stamp.read_text().split()
+            if saved_fingerprint == fingerprint:
+                return saved_digest
+        except (OSError, ValueError):
+            pass
+
+        digest = hashlib.blake2b(digest_size=16)
+        for f, rel, _ in entries:
+            digest.update(rel.encode())
+            digest.update(f.read_bytes())
+
+        try:
+            _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = stamp.with_suffix(f".{os.getpid()}.tmp")
+            tmp.write_text(f"{fingerprint} {digest.hexdigest()}")
+            os.replace(tmp, stamp)
+        except OSError:
+            pass
+        return digest.hexdigest()
+
+    def _prune_binaries(self, keep: Path) -> None:
+        """Drop binaries built from earlier sources of this go_server_dir"""
+        suffix = ".exe" if os.name == "nt" else ""
+        for old in _CACHE_DIR.glob(f"go-server-{self._location}-*{suffix}"):
+            if old == keep or ".partial" in old.name:
+                continue
+            try:
+                old.unlink()
+            except OSError:
+                # still running elsewhere (Windows locks it); the next prune gets it
+                continue
+            if self.verbose:
+                log.debug(f"{self}: pruned {old}")
+
+    def _cached_binary(self) -> Optional[Path]:
+        """Build the Go server once per source hash; returns the cached binary or None if the build fails"""
+        try:
+            return self._resolve_binary()
+        except OSError as e:
+            # unwritable cache dir (read-only $HOME), unreadable sources, go vanished from PATH: go run needs none of it
+            log.warning(f"{self}: binary cache unavailable, falling back to go run: {e}")
+            return None
+
+    def _resolve_binary(self) -> Optional[Path]:
+        src_dir = self.go_server_dir
+        entries = self._source_files()
+        fingerprint = self._fingerprint(entries)
+        resolved = GoServer._binaries.get(src_dir)
+        if resolved is not None and resolved[0] == fingerprint and resolved[1].exists():
+            return resolved[1]
+
+        suffix = ".exe" if os.name == "nt" else ""
+        binary = _CACHE_DIR / f"go-server-{self._location}-{self._source_digest(entries, fingerprint)}{suffix}"
+        if binary.exists():
+            GoServer._binaries[src_dir] = (fingerprint, binary)
+            return binary
+
+        # Sibling instances launch concurrently; only one of them should compile
+        with GoServer._build_lock:
+            if binary.exists():
+                # a sibling finished the build while we waited for the lock
+                GoServer._binaries[src_dir] = (fingerprint, binary)
+                return binary
+
+            if self.verbose:
+                log.debug(f"{self}: building {binary}")
+            binary.parent.mkdir(parents=True, exist_ok=True)
+            # Build beside the target and rename, so another process never runs a half-written binary
+            partial = binary.with_name(f"{binary.stem}.{os.getpid()}.partial{suffix}")
+            # Stream the build log line by line; only a short tail is kept for the failure message
+            tail = deque(maxlen=20)
+            proc = subprocess.Popen(
+                [_which_go(), "build", "-o", str(partial), "."],
+                cwd=str(src_dir), stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
+            )
+            self._drain(proc.stdout, "go.build", tail.append)
+            if proc.wait() != 0:
+                partial.unlink(missing_ok=True)
+                log.warning(f"{self}: go build failed, falling back to go run: {''.join(tail).strip()}")
+                return None
+            os.replace(partial, binary)
+            self._prune_binaries(keep=binary)
+        GoServer._binaries[src_dir] = (fingerprint, binary)
+        return binary
+
+    def _release_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+
+    def _on_stdout_line(self, line: str) -> None:
+        if "listening on" in line and self._listening is not None:
+            self._loop.call_soon_threadsafe(self._listening.set)
+
+    def _drain(self, stream, tag: str, on_line: Optional[Callable[[str], None]] = None) -> None:
+        """Read a subprocess pipe to EOF, forwarding lines to the log when verbose"""
+        for line in stream:
+            if on_line is not None:
+                on_line(line)
+            if self.verbose:
+                log.debug(f"{self} [{tag}]: {line.rstrip()}")
+
     @cached_property
     def thread(self) -> threading.Thread:
-        """Returns an unstarted thread that runs the go-server.ps1 script"""
+        """Returns an unstarted thread that runs the Go server, directly or via go-server.ps1"""
 
-        def _target():
-            script_path = Path(__file__).parent / "go_server.ps1"
-            if not script_path.exists():
-                log.error(f"{self}: script not found at {script_path}")
-                return
-
-            cmd = [
-                "powershell", "-ExecutionPolicy", "Bypass",
-                "-File", str(self.launcher_path),
-                "-Project", str(self.project_dir),
-                "-Port", str(self.port),
-                "-FastAPIPort", str(self.python_port)
-            ]
+        def _run():
+            pass_fds = ()
+            # Only the launcher needs a toolchain that actually runs (else PowerShell can repair it);
+            # the probe is cached process-wide, so sibling instances share one `go version`
+            if self.check_go_available(strict=True):
+                # Toolchain already present: skip the PowerShell install/version checks
+                binary = self._cached_binary()
+                cmd = [str(binary)] if binary else [_which_go(), "run", "main.go"]
+                cmd += [
+                    "-directory", str(self.project_dir),
+                    "-port", str(self.port),
+                    "-fastapi-port", str(self.python_port)
+                ]
+                if self.cors_origins:
+                    cmd += ["-cors-origins", ",".join(self.cors_origins)]
+                if binary and self._listener is not None and os.name != "nt":
+                    # `go run` would not forward the descriptor to its child, so only the built binary inherits it
+                    pass_fds = (self._listener.fileno(),)
+                    cmd += ["-listen-fd", str(pass_fds[0])]
+                cwd = self.go_server_dir
+            else:
+                if not self.launcher_path.exists():
+                    log.error(f"{self}: script not found at {self.launcher_path}")
+                    return
+
+                cmd = [
+                    "powershell", "-ExecutionPolicy", "Bypass",
+                    "-File", str(self.launcher_path),
+                    "-Project", str(self.project_dir),
+                    "-Port", str(self.port),
+                    "-FastAPIPort", str(self.python_port)
+                ]
+                if self.cors_origins:
+                    cmd += ["-CORSOrigins", ",".join(self.cors_origins)]
+                cwd = self.project_dir
+                # The launcher may install Go, so don't trust the negative result afterwards
+                GoServer._go_version_cache = None
+
+            if not pass_fds:
+                # the child binds the port itself, so give it up right before launching
+                self._release_listener()
 
             proc = subprocess.Popen(
                 cmd,
-                cwd=str(self.project_dir),
+                cwd=str(cwd),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True
+                text=True,
+                pass_fds=pass_fds
             )
             self._popen = proc
+            # the child holds its own copy of the descriptor now
+            self._release_listener()
 
-            if self.verbose:
-                for line in proc.stdout:
-                    log.debug(f"{self}: {line.strip()}")
-                for line in proc.stderr:
-                    log.debug(f"{self}: {line.strip()}")
+            # Drain both pipes concurrently; an unread pipe that fills up stalls the Go process
+            stderr_reader = threading.Thread(target=self._drain, args=(proc.stderr, "go.err"), daemon=True)
+            stderr_reader.start()
+            self._drain(proc.stdout, "go.out", self._on_stdout_line)
+            stderr_reader.join()
 
             proc.wait()
 
+        def _target():
+            try:
+                _run()
+            finally:
+                # however the launcher ends (child exited, script missing, error), wake start() instead of timing out
+                self._release_listener()
+                if self._exited is not None:
+                    try:
+                        self._loop.call_soon_threadsafe(self._exited.set)
+                    except RuntimeError:
+                        pass  # loop already closed, nobody is waiting
+
         return threading.Thread(target=_target, daemon=True)
 
     async def start(self):
         if self.thread.is_alive():
             if self.verbose:
                 log.debug(f"{self}: thread is running -> {self}")
-                return
+            return
 
         if self.verbose:
             log.debug(f"{self}: launching thread -> {self}")
 
+        self._loop = asyncio.get_running_loop()
+        self._listening = asyncio.Event()
+        self._exited = asyncio.Event()
         self.thread.start()
 
-        time.sleep(5)
-        return
+        # Ready as soon as either the "listening on" log line or a /health response shows up;
+        # the launcher thread ending first means it never will
+        listen_ready = asyncio.create_task(self._listening.wait())
+        health_ready = asyncio.create_task(
+            poll_until(self._check_health, deadline=time.monotonic() + 30)
+        )
+        exited = asyncio.create_task(self._exited.wait())
+        done, pending = await asyncio.wait(
+            {listen_ready, health_ready, exited}, timeout=30, return_when=asyncio.FIRST_COMPLETED
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+        if listen_ready in done or (health_ready in done and health_ready.result()):
+            if self.verbose:
+                log.debug(f"{self}: ready -> {self.url}")
+        elif exited in done:
+            code = self._popen.returncode if self._popen is not None else None
+            raise RuntimeError(f"{self}: Go server exited before it was ready (exit code {code})")
+        else:
+            log.warning(f"{self}: not ready after 30s, continuing anyway")
 
     async def is_running(self) -> bool:
         if not self.thread.is_alive():
             await self.start()
 
+        return await self._check_health()
+
+    async def _check_health(self) -> bool:
         if self.verbose:
             log.debug(f"{self}: checking {self.url}/health")
 
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.url}/health", timeout=1) as r:
-                    if self.verbose:
-                        log.debug(f"{self}: /health returned {r.status}")
-                    return r.status < 500
-        except Exception:
+            # Probe the loopback address directly: no resolver round-trip, no ::1 attempt first
+            status, _ = await http_get("127.0.0.1", self.port, "/health", timeout=1.0)
+        except (OSError, asyncio.TimeoutError, ValueError):
             if self.verbose:
                 log.debug(f"{self}: health check failed")
             return False
 
+        if self.verbose:
+            log.debug(f"{self}: /health returned {status}")
+        return status < 500
+
     async def stop(self):
+        self._release_listener()
         if self._popen and self._popen.poll() is None:
             if self.verbose:
                 log.debug(f"{self}: terminating subprocess")
@@ -112,6 +427,16 @@ class GoServer:
             if self.verbose:
                 log.debug(f"{self}: no active subprocess to stop")
 
+    async def aclose(self) -> None:
+        await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
     def get_status(self) -> dict:
         if self.verbose:
             log.debug(f"{self}: getting status")
@@ -0,0 +1,362 @@
+"""
+HTMX App - FastAPI application built from the Go server's route registry
+"""
+import asyncio
+import hashlib
+import marshal
+import os
+import threading
+from fastapi import APIRouter, FastAPI, Request
+from fastapi.responses import HTMLResponse, PlainTextResponse, JSONResponse, Response
+from functools import lru_cache
+from typing import Optional, Dict, Any, List, Callable, Tuple
+from loguru import logger as log
+import importlib.util
+import inspect
+import itertools
+import json
+import pathlib
+import sys
+from collections import defaultdict
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from importlib.machinery import ModuleSpec
+from types import CodeType, ModuleType
+from urllib.parse import parse_qs, parse_qsl
+
+
+# /health never changes; one prebuilt response skips the threadpool hop and JSON encoding per probe
+_HEALTH_RESPONSE = Response(content=b'{"status":"ok"}', media_type="application/json")
+
+
+# Fallback bytecode store for projects whose py_htmx/__pycache__ can't be written (read-only tree)
+_PYC_CACHE_DIR = pathlib.Path.home() / ".cache" / "htmlnojs" / "pyc"
+
+
+@lru_cache(maxsize=256)
+def _compile_module(file: str, mtime_ns: int, size: int) -> Tuple[ModuleSpec, CodeType]:
+    """Read and compile a py_htmx file (or reuse cached bytecode); safe to call from worker threads"""
+    spec = importlib.util.spec_from_file_location(pathlib.Path(file).stem, file)
+    pycache = importlib.util.cache_from_source(file)
+    if os.path.exists(pycache):
+        # the stdlib loader validates and reuses __pycache__ on its own
+        return spec, spec.loader.get_code(spec.name)
+
+    # <path hash>-<version hash>.pyc: size catches same-mtime edits, the prefix finds this file's older entries
+    path_key = hashlib.blake2b(file.encode(), digest_size=8).hexdigest()
+    version_key = hashlib.blake2b(f"{mtime_ns}:{size}:{sys.implementation.cache_tag}".encode(), digest_size=8)
+    pyc = _PYC_CACHE_DIR / f"{path_key}-{version_key.hexdigest()}.pyc"
+    try:
+        return spec, marshal.loads(pyc.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    code = spec.loader.get_code(spec.name)
+    # -B / PYTHONDONTWRITEBYTECODE opts out of writing bytecode anywhere, this cache included
+    if not sys.dont_write_bytecode and not os.path.exists(pycache):
+        try:
+            _PYC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp = pyc.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(marshal.dumps(code))
+            os.replace(tmp, pyc)
+            for stale in _PYC_CACHE_DIR.glob(f"{path_key}-*.pyc"):
+                if stale != pyc:
+                    stale.unlink(missing_ok=True)
+        except OSError as e:
+            log.debug(f"Could not cache bytecode for {file}: {e}")
+    return spec, code
+
+
+@lru_cache(maxsize=256)
+def _load_module(file: str, mtime_ns: int, size: int) -> ModuleType:
+    """Import a py_htmx file once; mtime_ns and size key the cache so edits reload."""
+    spec, code = _compile_module(file, mtime_ns, size)
+    mod = importlib.util.module_from_spec(spec)
+    exec(code, mod.__dict__)
+    return mod
+
+
+def _precompile(files: List[pathlib.Path]) -> None:
+    """Overlap file reads and compilation across a thread pool; module bodies still execute serially"""
+    def _warm(path: pathlib.Path) -> None:
+        try:
+            st = path.stat()
+            _compile_module(path.as_posix(), st.st_mtime_ns, st.st_size)
+        except Exception:
+            pass  # reported by the serial load that follows
+
+    if len(files) > 1:
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as pool:
+            list(pool.map(_warm, files))
+
+
+async def _read_query(request: Request) -> Dict[str, Any]:
+    """GET-style routes: handler data comes from query parameters"""
+    data = dict(request.query_params)
+    log.debug(f"Query params: {data}")
+    return data
+
+
+async def _read_json(request: Request) -> Dict[str, Any]:
+    """JSON body"""
+    body = await request.body()
+    data = json.loads(body) if body else {}
+    log.debug(f"JSON data: {data}")
+    return data
+
+
+async def _read_form(request: Request) -> Dict[str, Any]:
+    """URL-encoded form body, decoded straight from the raw bytes (no FormData/UploadFile plumbing)"""
+    body = await request.body()
+    # latin-1 never fails on raw bytes; percent-escapes are then decoded as UTF-8 with replacement,
+    # the same as Starlette's own form parser, so a badly encoded body can't turn into a 500
+    data = dict(parse_qsl(body.decode("latin-1"), keep_blank_values=True)) if body else {}
+    log.debug(f"Form data: {data}")
+    return data
+
+
+async def _read_body(request: Request) -> Dict[str, Any]:
+    """POST routes without a declared content type: pick the parser from the request header"""
+    content_type = request.headers.get("content-type", "")
+    log.debug(f"POST request with content-type: {content_type}")
+
+    if content_type.startswith("application/json"):
+        return await _read_json(request)
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return await _read_form(request)
+
+    if not content_type.startswith("multipart/form-data"):
+        # request.form() parses nothing for other types either; don't set up a parser just to find that out
+        return {}
+
+    # Multipart: let Starlette's form parser handle it
+    data = {}
+    try:
+        form_data = await request.form()
+        data = dict(form_data)
+        log.debug(f"Default form data: {data}")
+    except Exception as e:
+        log.error(f"Failed to parse form data: {e}")
+        # Try to read raw body
+        body = await request.body()
+        log.debug(f"Raw body: {body}")
+        if body:
+            # Parse form data manually
+            body_str = body.decode('utf-8')
+            parsed = parse_qs(body_str)
+            data = {k: v[0] if v else '' for k, v in parsed.items()}
+            log.debug(f"Manually parsed data: {data}")
+    return data
+
+
+# header name <-> CGI suffix ("user-agent" <-> "USER_AGENT"), applied only to the names a handler touches
+_HDR_TBL = str.maketrans("abcdefghijklmnopqrstuvwxyz-", "ABCDEFGHIJKLMNOPQRSTUVWXYZ_")
+_HDR_TBL_REV = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ_", "abcdefghijklmnopqrstuvwxyz-")
+
+
+class _HeaderView(Mapping):
+    """Read-only CGI-style view (HTTP_USER_AGENT, ...) over the request headers; nothing is converted up front"""
+    __slots__ = ("_headers",)
+
+    def __init__(self, headers):
+        self._headers = headers
+
+    def __getitem__(self, key: str) -> str:
+        if not key.startswith("HTTP_"):
+            raise KeyError(key)
+        return self._headers[key[5:].translate(_HDR_TBL_REV)]
+
+    def __iter__(self):
+        return ("HTTP_" + name.translate(_HDR_TBL) for name in self._headers.keys())
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+
+_HTML_HEADERS = {"content-type": "text/html; charset=utf-8"}
+
+
+def _html_response(result: Any, status_code: int = 200) -> Response:
+    """Handler output as an HTML response; bytes pass through untouched and the content-type is never re-derived"""
+    if not isinstance(result, bytes):
+        result = b"" if result is None else (result if isinstance(result, str) else str(result)).encode("utf-8")
+    return Response(content=result, status_code=status_code, headers=_HTML_HEADERS)
+
+
+# Unmatched paths get one prebuilt HTML fragment, styled like handler errors, instead of a per-miss exception + JSON
+_NOT_FOUND_RESPONSE = Response(
+    content=b'<div class="alert alert-error"><strong>Error:</strong> Not found</div>',
+    status_code=404, headers=_HTML_HEADERS
+)
+
+
+# Registry "content_type" hints that let a POST route skip header negotiation
+_BODY_READERS = {"json": _read_json, "form": _read_form}
+
+
+def htmx_sync_fast(func: Callable) -> Callable:
+    """Mark a sync py_htmx handler as non-blocking so it runs on the event loop instead of a worker thread"""
+    func.__htmx_sync_fast__ = True
+    return func
+
+
+def _make_handler(handler_func: Callable, func_name: str, method: str, content_type: Optional[str] = None) -> Callable:
+    """Bind a py_htmx function to an endpoint; parser and sync/async dispatch are fixed at registration"""
+    if method == "POST":
+        read_data = _BODY_READERS.get(content_type, _read_body)
+    else:
+        read_data = _read_query
+    is_coroutine = inspect.iscoroutinefunction(handler_func)
+    run_inline = getattr(handler_func, "__htmx_sync_fast__", False)
+
+    async def handler(request: Request):
+        try:
+            log.debug(f"Calling {func_name} with request")
+            data = await read_data(request)
+            if isinstance(data, dict):
+                # CGI-style header keys, e.g. data["_headers"]["HTTP_USER_AGENT"]
+                data["_headers"] = _HeaderView(request.headers)
+
+            log.debug(f"Final data passed to {func_name}: {data}")
+            if is_coroutine:
+                result = await handler_func(data)
+            elif run_inline:
+                # opted out via @htmx_sync_fast: cheap enough that the thread hop would cost more than the call
+                result = handler_func(data)
+            else:
+                # Sync handlers may block (DB, HTTP); keep them off the event loop like FastAPI's own def endpoints
+                result = await asyncio.to_thread(handler_func, data)
+
+            # Return HTML response
+            return _html_response(result)
+
+        except Exception as e:
+            log.error(f"Error in handler {func_name}: {e}")
+            return _html_response(f'<div class="alert alert-error"><strong>Error:</strong> {str(e)}</div>', 500)
+    return handler
+
+
+_HTTP_METHODS = frozenset({"GET", "POST", "PUT", "PATCH", "DELETE"})
+
+
+def _validate_routes(python_routes: List[Dict[str, Any]], project_dir: pathlib.Path) -> List[Tuple[str, str, str, Callable, Optional[str]]]:
+    """
+    Resolve registry entries to (method, fastapi_route, function_name, function, content_type)
+    Broken entries (missing file, unknown function, bad method, duplicate route) are logged and skipped
+    """
+    # group routes by the py_htmx file that defines them so each file is loaded once;
+    # resolving the directory up front keeps module cache keys canonical across path spellings
+    py_htmx_dir = project_dir.resolve() / "py_htmx"
+    by_file: Dict[pathlib.Path, List[Dict[str, Any]]] = defaultdict(list)
+    for e in python_routes:
+        go_route = e.get("route")  # This is "/api/demo/hello"
+        if not go_route:
+            log.error(f"Skipping registry entry without route: {e}")
+            continue
+
+        # Strip /api/ prefix to match what Go server actually calls
+        fastapi_route = go_route.replace("/api/", "/", 1) if go_route.startswith("/api/") else go_route
+
+        # Extract module name from the stripped route
+        parts = fastapi_route.strip("/").split("/")
+        module = parts[0] if len(parts) > 0 else "demo"  # fallback to demo
+
+        by_file[py_htmx_dir / f"{module}.py"].append({**e, "fastapi_route": fastapi_route})
+
+    _precompile(list(by_file))
+
+    valid = []
+    bound = set()
+    for file_path, entries in by_file.items():
+        try:
+            st = file_path.stat()
+            mod = _load_module(file_path.as_posix(), st.st_mtime_ns, st.st_size)
+        except FileNotFoundError:
+            log.error(f"Skipping {len(entries)} route(s): {file_path} not found")
+            continue
+        except Exception as e:
+            log.error(f"Skipping {len(entries)} route(s): failed to load {file_path}: {e}")
+            continue
+
+        for e in entries:
+            fastapi_route = e["fastapi_route"]
+            fn_name = e.get("function")
+            method = e.get("method")
+            fn = getattr(mod, fn_name, None) if fn_name else None
+
+            if method not in _HTTP_METHODS:
+                log.error(f"Skipping {fastapi_route}: unsupported method {method!r}")
+            elif not callable(fn):
+                log.error(f"Skipping {fastapi_route}: function {fn_name} not found in {file_path}")
+            elif (method, fastapi_route) in bound:
+                log.error(f"Skipping {fastapi_route}: {method} already bound")
+            else:
+                bound.add((method, fastapi_route))
+                valid.append((method, fastapi_route, fn_name, fn, e.get("content_type")))
+                log.debug(f"Validated Python route {e.get('route')} -> FastAPI {fastapi_route} -> {fn_name} from {file_path}")
+
+    return valid
+
+
+def create_app_from_registry_map(reg_map: Dict[str, Any], project_dir: pathlib.Path) -> FastAPI:
+    """Build FastAPI app using registry map fetched from Go server"""
+    app = FastAPI()
+
+    # health endpoint
+    @app.get("/health")
+    async def health():
+        log.debug("Serving health check")
+        return _HEALTH_RESPONSE
+
+    html_routes = reg_map.get("html_routes", [])
+    css_routes = reg_map.get("css_routes", [])
+    python_routes = reg_map.get("python_routes", [])
+
+    # unmatched paths: serve the prebuilt 404 instead of Starlette's raise-and-render default
+    default_not_found = app.router.default
+
+    async def not_found(scope, receive, send):
+        if scope["type"] == "http":
+            await _NOT_FOUND_RESPONSE(scope, receive, send)
+        else:
+            await default_not_found(scope, receive, send)
+
+    app.router.default = not_found
+
+    # mount dynamic Python handlers on one router, attached to the app in a single include
+    router = APIRouter(default_response_class=HTMLResponse)
+    for method, fastapi_route, fn_name, fn, content_type in _validate_routes(python_routes, project_dir):
+        # Mount at the stripped path that Go server actually calls
+        router.add_api_route(fastapi_route, _make_handler(fn, fn_name, method, content_type), methods=[method])
+        log.success(f"Successfully mounted {method} {fastapi_route} -> {fn_name}")
+    app.include_router(router)
+
+    # the route maps are fixed for the app's lifetime, so render both bodies once
+    def _fastapi_route(go_route: str) -> str:
+        return go_route.replace("/api/", "/", 1) if go_route.startswith("/api/") else go_route
+
+    routes_text_body = "\n".join(itertools.chain(
+        ("=== HTMX FastAPI Route Map ===", ""),
+        (f"HTML GET {h.get('route')} -> {h.get('name')}" for h in html_routes),
+        ("",),
+        (f"CSS GET {c.get('route')} -> {c.get('name')} deps={c.get('dependencies', [])}" for c in css_routes),
+        ("",),
+        (f"PYTHON {p.get('method')} {p.get('route') or ''} -> FastAPI {_fastapi_route(p.get('route') or '')} "
+         f"-> {p.get('function')}" for p in python_routes),
+        (f"\nTOTAL ROUTES {reg_map.get('total_routes', len(python_routes))}",),
+    )).encode("utf-8")
+    routes_json_body = json.dumps(reg_map).encode("utf-8")
+
+    # human-readable route map
+    @app.get("/_routes", response_class=PlainTextResponse)
+    async def routes_text():
+        log.debug("Serving human-readable route map")
+        return PlainTextResponse(routes_text_body)
+
+    # machine-readable route map
+    @app.get("/_routes.json", response_class=JSONResponse)
+    async def routes_json():
+        log.debug("Serving JSON route map")
+        return Response(content=routes_json_body, media_type="application/json")
+
+    return app
@@ -1,249 +1,169 @@
-import threading, time
-from fastapi import FastAPI, Request
-from fastapi.responses import PlainTextResponse, JSONResponse
-import uvicorn
-from functools import cached_property
-from typing import Optional, Dict, Any, List
+import asyncio
+import socket
+import time
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from loguru import logger as log
 import importlib.util
-import requests
+import json
 import pathlib
+import sys
 
+from .polling import http_get, poll_until
 
-def create_app_from_registry_map(reg_map: Dict[str, Any], project_dir: pathlib.Path) -> FastAPI:
-    """Build FastAPI app using registry map fetched from Go server."""
-    app = FastAPI()
+if TYPE_CHECKING:
+    import uvicorn
 
-    # health endpoint
-    @app.get("/health")
-    def health():
-        log.debug("Serving health check")
-        return JSONResponse({"status": "ok"})
 
-    html_routes = reg_map.get("html_routes", [])
-    css_routes = reg_map.get("css_routes", [])
-    python_routes = reg_map.get("python_routes", [])
+# httptools is uvicorn's fast C parser; fall back to pure-Python h11 when it isn't installed
+_HTTP_IMPL = "httptools" if importlib.util.find_spec("httptools") else "h11"
 
-    # mount dynamic Python handlers
-    for e in python_routes:
-        go_route = e.get("route")  # This is "/api/demo/hello"
-        fn_name = e.get("function")
-        method = e.get("method")
 
-        # Strip /api/ prefix to match what Go server actually calls
-        fastapi_route = go_route.replace("/api/", "/", 1) if go_route.startswith("/api/") else go_route
+def __getattr__(name: str):
+    # the app builder lives in .htmx_app so importing this module doesn't pull in FastAPI
+    if name == "create_app_from_registry_map":
+        from .htmx_app import create_app_from_registry_map
+        return create_app_from_registry_map
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-        # Extract module name from the stripped route
-        parts = fastapi_route.strip("/").split("/")
-        module = parts[0] if len(parts) > 0 else "demo"  # fallback to demo
 
-        file_path = project_dir.joinpath("py_htmx", f"{module}.py")
-        log.debug(f"Mounting Python route {go_route} -> FastAPI {fastapi_route} -> {fn_name} from {file_path}")
+def _intern_registry(reg_map: Dict[str, Any]) -> Dict[str, Any]:
+    """Intern the repeated short strings of a decoded registry in place"""
+    for key in ("html_routes", "css_routes", "python_routes"):
+        for e in reg_map.get(key) or []:
+            for field in ("method", "route"):
+                if isinstance(e.get(field), str):
+                    e[field] = sys.intern(e[field])
+    return reg_map
 
-        try:
-            spec = importlib.util.spec_from_file_location(
-                pathlib.Path(file_path).stem, file_path.as_posix()
-            )
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-
-            # Check if function exists
-            if not hasattr(mod, fn_name):
-                log.error(f"Function {fn_name} not found in {file_path}")
-                continue
-
-            fn = getattr(mod, fn_name)
-            log.debug(f"Successfully loaded function {fn_name} from {module}.py")
-
-            # Create handler with proper function binding
-            def create_handler(handler_func, func_name):
-                async def handler(request: Request):
-                    try:
-                        log.debug(f"Calling {func_name} with request")
-                        log.debug(f"Content-Type: {request.headers.get('content-type', 'None')}")
-                        log.debug(f"Method: {request.method}")
-
-                        data = {}
-
-                        # Handle different content types
-                        if request.method == "POST":
-                            content_type = request.headers.get("content-type", "")
-                            log.debug(f"POST request with content-type: {content_type}")
-
-                            if content_type.startswith("application/json"):
-                                data = await request.json()
-                                log.debug(f"JSON data: {data}")
-                            elif content_type.startswith("application/x-www-form-urlencoded"):
-                                form_data = await request.form()
-                                data = dict(form_data)
-                                log.debug(f"Form data: {data}")
-
-                                # If form data is empty, try reading raw body
-                                if not data:
-                                    try:
-                                        body = await request.body()
-                                        log.debug(f"Raw body (form empty): {body}")
-                                        if body:
-                                            from urllib.parse import parse_qs
-                                            body_str = body.decode('utf-8')
-                                            log.debug(f"Body string: {body_str}")
-                                            parsed = parse_qs(body_str)
-                                            data = {k: v[0] if v else '' for k, v in parsed.items()}
-                                            log.debug(f"Manually parsed data: {data}")
-                                    except Exception as e:
-                                        log.error(f"Failed to parse raw body: {e}")
-                            else:
-                                # HTMX default form submission
-                                try:
-                                    form_data = await request.form()
-                                    data = dict(form_data)
-                                    log.debug(f"Default form data: {data}")
-                                except Exception as e:
-                                    log.error(f"Failed to parse form data: {e}")
-                                    # Try to read raw body
-                                    body = await request.body()
-                                    log.debug(f"Raw body: {body}")
-                                    if body:
-                                        # Parse form data manually
-                                        from urllib.parse import parse_qs
-                                        body_str = body.decode('utf-8')
-                                        parsed = parse_qs(body_str)
-                                        data = {k: v[0] if v else '' for k, v in parsed.items()}
-                                        log.debug(f"Manually parsed data: {data}")
-                        else:
-                            # GET request - use query parameters
-                            data = dict(request.query_params)
-                            log.debug(f"Query params: {data}")
-
-                        log.debug(f"Final data passed to {func_name}: {data}")
-                        result = handler_func(data)
-
-                        # Return HTML response
-                        from fastapi.responses import HTMLResponse
-                        return HTMLResponse(content=result)
-
-                    except Exception as e:
-                        log.error(f"Error in handler {func_name}: {e}")
-                        return HTMLResponse(
-                            content=f'<div class="alert alert-error"><strong>Error:</strong> {str(e)}</div>',
-                            status_code=500
-                        )
-                return handler
-
-            # Create the handler with proper function binding
-            route_handler = create_handler(fn, fn_name)
-
-            # Mount at the stripped path that Go server actually calls
-            app.add_api_route(fastapi_route, route_handler, methods=[method])
-            log.success(f"Successfully mounted {method} {fastapi_route} -> {fn_name}")
-
-        except Exception as e:
-            log.error(f"Failed to mount route {fastapi_route}: {e}")
-
-    # human-readable route map
-    @app.get("/_routes", response_class=PlainTextResponse)
-    def routes_text():
-        log.debug("Serving human-readable route map")
-        lines = ["=== HTMX FastAPI Route Map ===", ""]
-        for h in html_routes:
-            lines.append(f"HTML GET {h.get('route')} -> {h.get('name')}")
-        lines.append("")
-        for c in css_routes:
-            deps = c.get('dependencies', [])
-            lines.append(f"CSS GET {c.get('route')} -> {c.get('name')} deps={deps}")
-        lines.append("")
-        for p in python_routes:
-            go_route = p.get('route')
-            fastapi_route = go_route.replace("/api/", "/", 1) if go_route.startswith("/api/") else go_route
-            lines.append(f"PYTHON {p.get('method')} {go_route} -> FastAPI {fastapi_route} -> {p.get('function')}")
-        lines.append(f"\nTOTAL ROUTES {reg_map.get('total_routes', len(python_routes))}")
-        return "\n".join(lines)
-
-    # machine-readable route map
-    @app.get("/_routes.json", response_class=JSONResponse)
-    def routes_json():
-        log.debug("Serving JSON route map")
-        return reg_map
-
-    return app
 
 class HTMXServer:
-    """Runs FastAPI HTMX server in background, waiting on Go server."""
+    """Runs the FastAPI HTMX server as a task on the caller's event loop, waiting on Go server."""
 
-    def __init__(self, project_dir: str, port: int, go_port: int = 3000, host: str = "127.0.0.1", verbose: bool = True):
+    def __init__(self, project_dir: str, port: int, go_port: int = 3000, host: str = "127.0.0.1", verbose: bool = True,
+                 sock: Optional[socket.socket] = None):
         self.project_dir = pathlib.Path(project_dir)
         self.port = port                # HTMX FastAPI server port
         self.go_port = go_port          # Go server port
-        self.host = host                # Host for both servers
+        self.host = sys.intern(host)    # Host for both servers
         self.verbose = verbose
         # construct base URLs from host and ports
         self.base_go_url = f"http://{self.host}:{self.go_port}"
         self.base_htmx_url = f"http://{self.host}:{self.port}"
 
-        self._server: Optional[uvicorn.Server] = None
+        self._sock = sock               # reserved listening socket for `port`, used by the first serve()
+        self._server: Optional["uvicorn.Server"] = None
+        self._serve_task: Optional[asyncio.Task] = None
+        self._started = False
         if self.verbose: log.debug(f"HTMXServer config: go_url={self.base_go_url}, htmx_url={self.base_htmx_url}")
 
     def __repr__(self) -> str:
         return f"<HTMXServer go_url={self.base_go_url} htmx_url={self.base_htmx_url} dir={self.project_dir}>"
 
-    @cached_property
-    def thread(self) -> threading.Thread:
-        def run():
-            # wait for Go server health
-            for i in range(20):
-                try:
-                    r = requests.get(f"{self.base_go_url}/health", timeout=1)
-                    if r.status_code < 500:
-                        if self.verbose: log.debug(f"Go server healthy: {r.status_code}")
-                        break
-                except Exception as err:
-                    if self.verbose: log.debug(f"Waiting for Go server (attempt {i+1}): {err}")
-                time.sleep(0.5)
-
-            # fetch registry
-            try:
-                resp = requests.get(f"{self.base_go_url}/_routes.json", timeout=2)
-                resp.raise_for_status()
-                reg_map = resp.json()
-                if self.verbose: log.debug(f"Loaded registry keys: {list(reg_map.keys())}")
-            except Exception as err:
-                log.error(f"Failed to load registry: {err}")
-                reg_map = {}
-
-            app = create_app_from_registry_map(reg_map, self.project_dir)
-            cfg = uvicorn.Config(app, host=self.host, port=self.port, log_level="info")
-            self._server = uvicorn.Server(cfg)
-            self._started = True
-            if self.verbose: log.debug(f"Starting HTMXServer on {self.base_htmx_url}")
-            self._server.run()
-            if self.verbose: log.debug("HTMXServer shutdown")
-
-        t = threading.Thread(target=run, daemon=True)
-        if self.verbose: log.debug("HTMXServer thread launched")
-        return t
+    @property
+    def url(self) -> str:
+        return self.base_htmx_url
 
-    async def is_running(self) -> bool:
-        if not self.thread.is_alive():
-            self.thread.start()
-            
+    async def _go_healthy(self) -> bool:
+        try:
+            status, _ = await http_get(self.host, self.go_port, "/health", timeout=0.5)
+        except (OSError, asyncio.TimeoutError, ValueError) as err:
+            if self.verbose: log.debug(f"Waiting for Go server: {err!r}")
+            return False
+        if self.verbose: log.debug(f"Go server health: {status}")
+        return status < 500
+
+    async def _wait_for_go(self) -> None:
+        if not await poll_until(self._go_healthy, deadline=time.monotonic() + 10.0):
+            log.warning(f"Go server not healthy after 10s at {self.base_go_url}")
+
+    async def _fetch_registry(self) -> Dict[str, Any]:
         try:
-            import aiohttp
-            async with aiohttp.ClientSession() as s:
-                r = await s.get(f"{self.base_htmx_url}/health", timeout=2)
-                ok = r.status < 500
-                if self.verbose: log.debug(f"Health check at {self.base_htmx_url}/health: {r.status}")
-                return ok
+            status, body = await http_get(self.host, self.go_port, "/_routes.json")
+            if status != 200:
+                raise ValueError(f"HTTP {status}")
+            reg_map = _intern_registry(json.loads(body))
+            if self.verbose: log.debug(f"Loaded registry keys: {list(reg_map.keys())}")
+            return reg_map
         except Exception as err:
-            log.warning(f"Health check error: {err}")
+            log.error(f"Failed to load registry: {err!r}")
+            return {}
+
+    async def _serve(self) -> None:
+        # uvicorn closes the socket on shutdown, so a reserved one is only good for the first run
+        sockets, self._sock = ([self._sock] if self._sock is not None else None), None
+        try:
+            await self._server.serve(sockets=sockets)
+        except SystemExit:
+            # uvicorn exits the process on bind failure; keep that contained to this task
+            log.error(f"HTMXServer could not bind {self.base_htmx_url}")
+        if self.verbose: log.debug("HTMXServer shutdown")
+
+    async def _bound(self) -> bool:
+        if self._serve_task.done():
+            raise RuntimeError(f"HTMXServer failed to start on {self.base_htmx_url}")
+        return self._server.started
+
+    async def start(self) -> None:
+        if self._serve_task is not None and not self._serve_task.done():
+            if self.verbose: log.debug("HTMXServer already running")
+            return
+
+        # FastAPI and uvicorn are only needed once a server actually starts
+        import uvicorn
+        from .htmx_app import create_app_from_registry_map
+
+        await self._wait_for_go()
+        reg_map = await self._fetch_registry()
+
+        app = create_app_from_registry_map(reg_map, self.project_dir)
+        cfg = uvicorn.Config(
+            app, host=self.host, port=self.port, log_level="info", loop="asyncio",
+            http=_HTTP_IMPL, access_log=self.verbose
+        )
+        self._server = uvicorn.Server(cfg)
+        if self.verbose: log.debug(f"Starting HTMXServer on {self.base_htmx_url}")
+        self._serve_task = asyncio.create_task(self._serve())
+
+        # `started` flips once startup hooks have run and the socket is bound
+        if not await poll_until(self._bound, deadline=time.monotonic() + 30.0, initial=0.025, multiplier=2.0):
+            raise RuntimeError(f"HTMXServer did not start within 30s on {self.base_htmx_url}")
+        self._started = True
+        if self.verbose: log.debug(f"HTMXServer ready at {self.base_htmx_url}")
+
+    async def is_running(self) -> bool:
+        if self._serve_task is None or self._serve_task.done():
+            await self.start()
+
+        try:
+            status, _ = await http_get(self.host, self.port, "/health")
+        except (OSError, asyncio.TimeoutError, ValueError) as err:
+            log.warning(f"Health check error: {err!r}")
             return False
+        if self.verbose: log.debug(f"Health check at {self.base_htmx_url}/health: {status}")
+        return status < 500
 
     async def stop(self) -> None:
-        if self._server and self._server.started:
+        if self._serve_task is not None and not self._serve_task.done():
             if self.verbose: log.debug("Stopping HTMXServer")
-            await self._server.shutdown()
+            self._server.should_exit = True
+            await self._serve_task
             self._started = False
             log.success("HTMXServer stopped")
 
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    async def aclose(self) -> None:
+        await self.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
     def get_status(self) -> Dict[str, Any]:
         status = {
             "go_url": self.base_go_url,
@@ -1,6 +1,8 @@
 """
 Instance Registry - Manages HTMLnoJS application instances
 """
+import threading
+from pathlib import Path
 from typing import Dict, Optional, List, TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -8,19 +10,28 @@ if TYPE_CHECKING:
 
 
 class InstanceRegistry:
-    """Registry for managing HTMLnoJS instances"""
+    """
+    Registry for managing HTMLnoJS instances
+    Writers swap in a fresh dict under a lock (copy-on-write); readers use the current snapshot lock-free
+    """
 
     _instances: Dict[str, 'HTMLnoJS'] = {}
+    _lock = threading.Lock()
 
     @classmethod
     def register(cls, instance: 'HTMLnoJS') -> None:
         """Register an instance"""
-        cls._instances[instance.id] = instance
+        with cls._lock:
+            cls._instances = {**cls._instances, instance.id: instance}
 
     @classmethod
     def unregister(cls, instance_id: str) -> None:
         """Unregister an instance"""
-        cls._instances.pop(instance_id, None)
+        with cls._lock:
+            if instance_id in cls._instances:
+                snapshot = dict(cls._instances)
+                del snapshot[instance_id]
+                cls._instances = snapshot
 
     @classmethod
     def get(cls, instance_id: str) -> Optional['HTMLnoJS']:
@@ -48,7 +59,6 @@ class InstanceRegistry:
     @classmethod
     def find_by_project(cls, project_dir: str) -> Optional['HTMLnoJS']:
         """Find instance by project directory"""
-        from pathlib import Path
         target_dir = Path(project_dir).resolve()
 
         for instance in cls._instances.values():
@@ -66,7 +76,8 @@ class InstanceRegistry:
     @classmethod
     def clear(cls) -> None:
         """Clear the registry"""
-        cls._instances.clear()
+        with cls._lock:
+            cls._instances = {}
 
     @classmethod
     def get_status_summary(cls) -> dict:
@@ -0,0 +1,50 @@
+"""
+Polling - Deadline-bound async polling with jittered exponential backoff, plus a minimal loopback HTTP client
+"""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Tuple
+
+
+async def poll_until(probe: Callable[[], Awaitable[bool]], deadline: float, initial: float = 0.05,
+                     multiplier: float = 1.5, max_interval: float = 0.5, jitter: float = 0.1) -> bool:
+    """
+    Await `probe` until it returns True or the time.monotonic() `deadline` passes
+    Sleeps start at `initial`, grow by `multiplier` up to `max_interval`, and are scaled by up to +/- `jitter`
+    """
+    interval = initial
+    while True:
+        if await probe():
+            return True
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+
+        await asyncio.sleep(min(remaining, interval * random.uniform(1 - jitter, 1 + jitter)))
+        interval = min(interval * multiplier, max_interval)
+
+
+async def http_get(host: str, port: int, path: str, timeout: float = 2.0) -> Tuple[int, bytes]:
+    """
+    GET `path` with a bare HTTP/1.0 request over asyncio streams and return (status, body)
+    Only meant for our own loopback servers: no redirects, TLS, chunking or connection reuse
+    Raises OSError / asyncio.TimeoutError when unreachable and ValueError on a malformed reply
+    """
+    async def _get() -> Tuple[int, bytes]:
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.0\r\nHost: {host}:{port}\r\n\r\n".encode("latin-1"))
+            await writer.drain()
+            response = await reader.read()  # HTTP/1.0: the server closes once the body is sent
+        finally:
+            writer.close()
+
+        head, _, body = response.partition(b"\r\n\r\n")
+        try:
+            return int(head.split(None, 2)[1]), body
+        except (IndexError, ValueError):
+            raise ValueError(f"malformed HTTP response from {host}:{port}{path}") from None
+
+    return await asyncio.wait_for(_get(), timeout)
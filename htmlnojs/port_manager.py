@@ -4,10 +4,18 @@ Port Manager - Handles port allocation and availability with process management
 import socket
 import subprocess
 import platform
+import time
+from concurrent.futures import ThreadPoolExecutor
 import psutil
 from typing import List, Tuple, Optional, Dict
 from loguru import logger as log
 
+# Largest batch of ports probed concurrently by find_available_ports
+_SCAN_WINDOW = 32
+
+# On Windows SO_REUSEADDR lets a socket steal a port that is actively bound, which would report busy ports as free
+_REUSE_ADDR = platform.system() != "Windows"
+
 
 class PortManager:
     """Manages port allocation and process management for HTMLnoJS services"""
@@ -18,24 +26,57 @@ class PortManager:
         ports = PortManager.find_available_ports(start_port, count)
         return ports[0] if ports else None
 
+    @staticmethod
+    def _scan(start_port: int, end_port: int, first_window: int):
+        """
+        Yield (port, available) in port order
+        The first window is probed inline (it usually succeeds, and a pool costs more than a few binds);
+        later windows grow up to _SCAN_WINDOW and are probed in parallel
+        """
+        window = max(first_window, 1)
+        first = range(start_port, min(start_port + window, end_port))
+        for port in first:
+            yield port, PortManager.is_port_available(port)
+
+        current_port = first.stop
+        if current_port >= end_port:
+            return
+        window = min(window * 2, _SCAN_WINDOW)
+        with ThreadPoolExecutor(max_workers=_SCAN_WINDOW) as pool:
+            while current_port < end_port:
+                candidates = range(current_port, min(current_port + window, end_port))
+                yield from zip(candidates, pool.map(PortManager.is_port_available, candidates))
+                current_port, window = candidates.stop, min(window * 2, _SCAN_WINDOW)
+
     @staticmethod
     def find_available_ports(start_port: int = 8080, count: int = 2) -> List[int]:
         """Find multiple available ports"""
         available_ports = []
-        current_port = start_port
-
-        while len(available_ports) < count and current_port < start_port + 1000:
-            if PortManager.is_port_available(current_port):
-                available_ports.append(current_port)
-            current_port += 1
-
+        for port, free in PortManager._scan(start_port, start_port + 1000, count):
+            if free:
+                available_ports.append(port)
+                if len(available_ports) == count:
+                    break
         return available_ports
 
+    @staticmethod
+    def find_available_pair(start_port: int = 3000) -> Optional[Tuple[int, int]]:
+        """First consecutive (port, port + 1) with both ports free, from a single scan"""
+        previous_free = False
+        for port, free in PortManager._scan(start_port, start_port + 1000, 2):
+            if free and previous_free:
+                return port - 1, port
+            previous_free = free
+        return None
+
     @staticmethod
     def is_port_available(port: int) -> bool:
         """Check if a port is available"""
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                if _REUSE_ADDR:
+                    # servers bind with SO_REUSEADDR too, so a port lingering in TIME_WAIT counts as free
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 sock.bind(('', port))
                 return True
         except OSError:
@@ -45,9 +86,9 @@ class PortManager:
     def allocate_port_pair(start_port: int = 3000) -> Tuple[int, int]:
         """Allocate a pair of consecutive ports, killing processes if needed"""
         # First try to find available ports
-        ports = PortManager.find_available_ports(start_port, 2)
-        if len(ports) >= 2:
-            return ports[0], ports[1]
+        pair = PortManager.find_available_pair(start_port)
+        if pair:
+            return pair
 
         # If not available, kill processes on desired ports and retry
         log.warning(f"Ports {start_port} and {start_port + 1} not available, attempting to free them...")
@@ -55,17 +96,53 @@ class PortManager:
         PortManager.kill_process_on_port(start_port + 1)
 
         # Wait a moment and try again
-        import time
         time.sleep(1)
 
         if PortManager.is_port_available(start_port) and PortManager.is_port_available(start_port + 1):
             return start_port, start_port + 1
 
-        # Fallback to finding any available ports
-        ports = PortManager.find_available_ports(start_port + 2, 2)
-        if len(ports) < 2:
+        # Fallback to finding any available pair
+        pair = PortManager.find_available_pair(start_port + 2)
+        if pair is None:
             raise RuntimeError("Could not find two available ports")
-        return ports[0], ports[1]
+        return pair
+
+    @staticmethod
+    def reserve_port(port: int) -> Optional[socket.socket]:
+        """Bind and listen on loopback `port`; the caller owns the returned socket, None if the port is taken"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            if _REUSE_ADDR:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("127.0.0.1", port))
+            sock.listen(128)
+            return sock
+        except OSError:
+            sock.close()
+            return None
+
+    @staticmethod
+    def reserve_port_pair(start_port: int = 3000) -> Tuple[Tuple[int, socket.socket], Tuple[int, socket.socket]]:
+        """
+        allocate_port_pair, but each port comes with a listening socket that stays bound until handed to a server
+        Closes the window between checking a port and the server binding it
+        """
+        first, second = PortManager.allocate_port_pair(start_port)
+        for _ in range(5):
+            first_sock = PortManager.reserve_port(first)
+            second_sock = PortManager.reserve_port(second) if first_sock else None
+            if first_sock and second_sock:
+                return (first, first_sock), (second, second_sock)
+            if first_sock:
+                first_sock.close()
+
+            # lost a race for one of them; move past both and try the next free pair
+            pair = PortManager.find_available_pair(second + 1)
+            if pair is None:
+                break
+            first, second = pair
+
+        raise RuntimeError("Could not reserve two available ports")
 
     @staticmethod
     def get_process_using_port(port: int) -> Optional[Dict]:
@@ -110,7 +187,6 @@ class PortManager:
                 success = result.returncode == 0
             else:
                 # Unix/Linux/Mac approach
-                import signal
                 process = psutil.Process(pid)
                 if force:
                     process.kill()  # SIGKILL
@@ -156,7 +232,6 @@ class PortManager:
         results = PortManager.kill_processes_on_ports(*target_ports)
 
         # Wait for ports to be freed
-        import time
         time.sleep(2)
 
         # Verify ports are now available
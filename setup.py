@@ -14,7 +14,6 @@ setup(
     include_package_data=True,  # This tells setuptools to use MANIFEST.in
     install_requires=[
         "loguru>=0.6.0",
-        "aiohttp>=3.8.0",
     ],
     python_requires=">=3.8",
     classifiers=[
@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+
+import pytest
+
+from htmlnojs import go_server
+from htmlnojs.core import HTMLnoJS
+from htmlnojs.go_server import GoServer
+
+
+@pytest.mark.asyncio
+async def test_prepare_checks_go_without_spawning(tmp_path, monkeypatch):
+    monkeypatch.setattr(go_server, "_which_go", lambda: "/usr/local/bin/go")
+    monkeypatch.setattr(GoServer, "_probe_go", classmethod(lambda cls: pytest.fail("spawned go version")))
+    app = SimpleNamespace(project_dir=tmp_path, go_server=GoServer(str(tmp_path), 0, 0), verbose=False)
+    await HTMLnoJS._prepare(app)
+
+
+@pytest.mark.asyncio
+async def test_prepare_rejects_missing_project(tmp_path):
+    app = SimpleNamespace(project_dir=tmp_path / "missing", go_server=GoServer(str(tmp_path), 0, 0), verbose=False)
+    with pytest.raises(FileNotFoundError):
+        await HTMLnoJS._prepare(app)
+
+
+class _FakeServer:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.exited = False
+
+    async def start(self):
+        if self.fail:
+            raise RuntimeError("boom")
+
+    async def is_running(self):
+        return True
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.exited = True
+
+
+@pytest.mark.asyncio
+async def test_launch_unwinds_started_servers_when_one_fails():
+    go, htmx = _FakeServer(), _FakeServer(fail=True)
+    with pytest.raises(RuntimeError, match="boom"):
+        await HTMLnoJS._launch(SimpleNamespace(go_server=go, htmx_server=htmx))
+    assert go.exited
+    assert not htmx.exited
+
+
+@pytest.mark.asyncio
+async def test_launch_keeps_servers_running_on_success():
+    go, htmx = _FakeServer(), _FakeServer()
+    await HTMLnoJS._launch(SimpleNamespace(go_server=go, htmx_server=htmx))
+    assert not go.exited and not htmx.exited
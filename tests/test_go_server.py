@@ -0,0 +1,154 @@
+import os
+import time
+
+import pytest
+
+from htmlnojs import go_server
+from htmlnojs.go_server import GoServer
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    src = tmp_path / "go-server"
+    (src / "assets").mkdir(parents=True)
+    (src / "main.go").write_text('package main\n\n//go:embed assets/*\nvar assets string\n')
+    (src / "go.mod").write_text("module example\n")
+    (src / "go.sum").write_text("")
+    (src / "assets" / "a.md").write_text("a\n")
+    (src / "notes.txt").write_text("not a build input\n")
+    monkeypatch.setattr(go_server, "_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(GoServer, "_binaries", {})
+    srv = GoServer(str(tmp_path), 0, 0)
+    srv.go_server_dir = src
+    return srv
+
+
+def _digest(srv):
+    entries = srv._source_files()
+    return srv._source_digest(entries, srv._fingerprint(entries))
+
+
+def test_source_files_cover_go_sum_and_embeds(server):
+    names = [rel for _, rel, _ in server._source_files()]
+    assert names == ["assets/a.md", "go.mod", "go.sum", "main.go"]
+
+
+def test_source_digest_tracks_embedded_assets(server):
+    before = _digest(server)
+    assert _digest(server) == before
+    (server.go_server_dir / "assets" / "a.md").write_text("changed\n")
+    assert _digest(server) != before
+
+
+def test_source_digest_reuses_stamp(server, monkeypatch):
+    digest = _digest(server)
+
+    def no_reads(self):
+        raise AssertionError(f"re-read {self}")
+
+    monkeypatch.setattr(go_server.Path, "read_bytes", no_reads)
+    assert _digest(server) == digest
+
+
+def test_prune_binaries_keeps_current_and_foreign(server):
+    cache = go_server._CACHE_DIR
+    cache.mkdir()
+    prefix = f"go-server-{server._location}"
+    for name in (f"{prefix}-old", f"{prefix}-new", f"{prefix}-new.1.partial", "go-server-0000000000000000-x",
+                 f"{prefix}.stamp"):
+        (cache / name).write_text("")
+    server._prune_binaries(keep=cache / f"{prefix}-new")
+    assert sorted(p.name for p in cache.iterdir()) == sorted(
+        [f"{prefix}-new", f"{prefix}-new.1.partial", "go-server-0000000000000000-x", f"{prefix}.stamp"]
+    )
+
+
+def test_cached_binary_falls_back_when_cache_unwritable(server, tmp_path, monkeypatch):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(go_server, "_CACHE_DIR", blocker / "cache")
+    assert server._cached_binary() is None
+
+
+def test_cached_binary_reuses_existing_build(server):
+    binary = go_server._CACHE_DIR / f"go-server-{server._location}-{_digest(server)}{'.exe' if os.name == 'nt' else ''}"
+    binary.write_text("")
+    assert server._cached_binary() == binary
+
+
+def test_binary_memo_follows_source_fingerprint(server, monkeypatch):
+    first = go_server._CACHE_DIR / f"go-server-{server._location}-{_digest(server)}"
+    first.write_text("")
+    assert server._cached_binary() == first
+    assert GoServer._binaries[server.go_server_dir][1] == first
+
+    # a memo hit skips the stamp and content hash entirely
+    source_digest = GoServer._source_digest
+    monkeypatch.setattr(GoServer, "_source_digest", lambda *args: pytest.fail("memo not used"))
+    assert server._cached_binary() == first
+    monkeypatch.setattr(GoServer, "_source_digest", source_digest)
+
+    (server.go_server_dir / "main.go").write_text("package main\n")
+    second = go_server._CACHE_DIR / f"go-server-{server._location}-{_digest(server)}"
+    second.write_text("")
+    assert server._cached_binary() == second
+
+
+def test_binary_memo_set_when_built_by_sibling(server, monkeypatch):
+    binary = go_server._CACHE_DIR / f"go-server-{server._location}-{_digest(server)}"
+    real_exists = type(binary).exists
+    calls = []
+
+    def exists(path):
+        # the first check misses, then a sibling's build lands before the locked re-check
+        if path == binary:
+            calls.append(path)
+            if len(calls) == 1:
+                binary.write_text("")
+                return False
+        return real_exists(path)
+
+    monkeypatch.setattr(type(binary), "exists", exists)
+    assert server._cached_binary() == binary
+    assert GoServer._binaries[server.go_server_dir] == (server._fingerprint(server._source_files()), binary)
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not os.path.exists("/bin/false"), reason="needs /bin/false")
+async def test_start_fails_fast_when_process_exits(server, monkeypatch):
+    monkeypatch.setattr(GoServer, "check_go_available", lambda self, strict=False: True)
+    monkeypatch.setattr(GoServer, "_cached_binary", lambda self: go_server.Path("/bin/false"))
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="exit code 1"):
+        await server.start()
+    assert time.monotonic() - started < 5
+
+
+class _FakePopen:
+    commands = []
+
+    def __init__(self, cmd, **kwargs):
+        self.commands.append(cmd)
+        self.stdout, self.stderr, self.returncode = iter(()), iter(()), 0
+
+    def wait(self):
+        return 0
+
+
+@pytest.mark.parametrize("origins, expected", [
+    (None, None),
+    (["http://a.test", "http://b.test"], "http://a.test,http://b.test"),
+])
+def test_cors_origins_reach_the_go_command(server, monkeypatch, origins, expected):
+    monkeypatch.setattr(GoServer, "check_go_available", lambda self, strict=False: True)
+    monkeypatch.setattr(GoServer, "_cached_binary", lambda self: go_server.Path("/opt/go-server"))
+    monkeypatch.setattr(go_server.subprocess, "Popen", _FakePopen)
+    monkeypatch.setattr(_FakePopen, "commands", [])
+    server.cors_origins = tuple(origins or ())
+    server.thread.run()
+
+    cmd, = _FakePopen.commands
+    if expected is None:
+        assert "-cors-origins" not in cmd
+    else:
+        assert cmd[cmd.index("-cors-origins") + 1] == expected
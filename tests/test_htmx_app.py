@@ -0,0 +1,215 @@
+import marshal
+import os
+import sys
+from importlib.machinery import SourceFileLoader
+
+import pytest
+from fastapi.testclient import TestClient
+
+from htmlnojs import htmx_app
+from htmlnojs.htmx_app import _HeaderView, create_app_from_registry_map
+
+HANDLERS = '''
+import asyncio
+import json
+import threading
+
+from htmlnojs import htmx_sync_fast
+
+
+def echo(data):
+    return json.dumps({k: v for k, v in data.items() if k != "_headers"}, sort_keys=True, default=str)
+
+
+def header(data):
+    return data["_headers"].get("HTTP_X_TEST", "missing")
+
+
+def where(data):
+    return str(threading.get_ident())
+
+
+@htmx_sync_fast
+def where_fast(data):
+    return str(threading.get_ident())
+
+
+async def where_async(data):
+    await asyncio.sleep(0)
+    return str(threading.get_ident())
+
+
+def boom(data):
+    raise RuntimeError("kaboom")
+'''
+
+ROUTES = [
+    {"route": "/api/demo/echo", "function": "echo", "method": "GET"},
+    {"route": "/api/demo/echo", "function": "echo", "method": "POST"},
+    {"route": "/api/demo/form", "function": "echo", "method": "POST", "content_type": "form"},
+    {"route": "/api/demo/header", "function": "header", "method": "GET"},
+    {"route": "/api/demo/where", "function": "where", "method": "GET"},
+    {"route": "/api/demo/where_fast", "function": "where_fast", "method": "GET"},
+    {"route": "/api/demo/where_async", "function": "where_async", "method": "GET"},
+    {"route": "/api/demo/boom", "function": "boom", "method": "GET"},
+    {"route": "/api/demo/missing", "function": "nope", "method": "GET"},
+    {"route": "/api/demo/bad_method", "function": "echo", "method": "TRACE"},
+    {"route": "/api/nofile/x", "function": "x", "method": "GET"},
+]
+
+
+@pytest.fixture
+def client(tmp_path):
+    (tmp_path / "py_htmx").mkdir()
+    (tmp_path / "py_htmx" / "demo.py").write_text(HANDLERS)
+    app = create_app_from_registry_map({"python_routes": ROUTES, "total_routes": len(ROUTES)}, tmp_path)
+    with TestClient(app) as c:
+        yield c
+
+
+def test_get_reads_query(client):
+    resp = client.get("/demo/echo", params={"a": "1", "b": ""})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "text/html; charset=utf-8"
+    assert resp.json() == {"a": "1", "b": ""}
+
+
+def test_post_json(client):
+    assert client.post("/demo/echo", json={"a": 1}).json() == {"a": 1}
+
+
+def test_post_urlencoded(client):
+    assert client.post("/demo/echo", data={"a": "x y", "b": ""}).json() == {"a": "x y", "b": ""}
+
+
+def test_post_multipart(client):
+    resp = client.post("/demo/echo", data={"a": "1"}, files={"f": ("f.txt", b"hi")})
+    assert resp.status_code == 200
+    assert resp.json()["a"] == "1"
+
+
+def test_post_other_content_type_is_empty(client):
+    resp = client.post("/demo/echo", content=b"a=1", headers={"content-type": "text/plain"})
+    assert resp.json() == {}
+
+
+def test_registry_content_type_skips_negotiation(client):
+    resp = client.post("/demo/form", content=b"a=1", headers={"content-type": "text/plain"})
+    assert resp.json() == {"a": "1"}
+
+
+def test_post_urlencoded_non_utf8(client):
+    resp = client.post("/demo/echo", content=b"a=%ff\xff",
+                       headers={"content-type": "application/x-www-form-urlencoded"})
+    assert resp.status_code == 200
+    assert list(resp.json()) == ["a"]
+
+
+def test_headers_view(client):
+    assert client.get("/demo/header", headers={"X-Test": "yes"}).text == "yes"
+    assert client.get("/demo/header").text == "missing"
+
+
+def test_header_view_mapping():
+    view = _HeaderView({"user-agent": "ua", "x-custom-thing": "1"})
+    assert view["HTTP_USER_AGENT"] == "ua"
+    assert view.get("HTTP_X_CUSTOM_THING") == "1"
+    assert set(view) == {"HTTP_USER_AGENT", "HTTP_X_CUSTOM_THING"}
+    assert len(view) == 2
+    assert "HTTP_ACCEPT" not in view
+    with pytest.raises(KeyError):
+        view["user-agent"]
+
+
+def test_sync_dispatch(client):
+    loop_thread = client.get("/demo/where_async").text
+    assert client.get("/demo/where_fast").text == loop_thread
+    assert client.get("/demo/where").text != loop_thread
+
+
+def test_not_found(client):
+    resp = client.get("/nowhere")
+    assert resp.status_code == 404
+    assert resp.text == '<div class="alert alert-error"><strong>Error:</strong> Not found</div>'
+
+
+def test_wrong_method(client):
+    assert client.post("/demo/header").status_code == 405
+
+
+def test_broken_registry_entries_are_skipped(client):
+    assert client.get("/demo/missing").status_code == 404
+    assert client.get("/demo/bad_method").status_code == 404
+    assert client.get("/nofile/x").status_code == 404
+
+
+def test_handler_error_is_500_fragment(client):
+    resp = client.get("/demo/boom")
+    assert resp.status_code == 500
+    assert "kaboom" in resp.text
+    assert 'class="alert alert-error"' in resp.text
+
+
+def test_health(client):
+    resp = client.get("/health")
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "ok"}
+
+
+def test_route_maps_are_prerendered(client):
+    assert "PYTHON GET /api/demo/echo -> FastAPI /demo/echo -> echo" in client.get("/_routes").text
+    assert client.get("/_routes.json").json()["python_routes"] == ROUTES
+
+
+@pytest.fixture
+def pyc_cache(tmp_path, monkeypatch):
+    # Stand in for a read-only project: the stdlib loader can't write __pycache__, so the fallback is used
+    monkeypatch.setattr(SourceFileLoader, "set_data", lambda *args, **kwargs: None)
+    monkeypatch.setattr(htmx_app, "_PYC_CACHE_DIR", tmp_path / "pyc")
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    htmx_app._compile_module.cache_clear()
+    yield tmp_path / "pyc"
+    htmx_app._compile_module.cache_clear()
+
+
+def _compile(path):
+    st = path.stat()
+    return htmx_app._compile_module(path.as_posix(), st.st_mtime_ns, st.st_size)[1]
+
+
+def test_fallback_bytecode_replaces_entry_on_same_mtime_edit(tmp_path, pyc_cache):
+    src = tmp_path / "mod.py"
+    src.write_text("X = 1\n")
+    _compile(src)
+    first = list(pyc_cache.iterdir())
+
+    mtime = src.stat().st_mtime_ns
+    src.write_text("X = 22\n")
+    os.utime(src, ns=(mtime, mtime))
+    namespace = {}
+    exec(_compile(src), namespace)
+
+    assert namespace["X"] == 22
+    assert len(first) == 1
+    assert len(list(pyc_cache.iterdir())) == 1
+    assert list(pyc_cache.iterdir()) != first
+
+
+def test_fallback_bytecode_honours_dont_write_bytecode(tmp_path, pyc_cache, monkeypatch):
+    src = tmp_path / "mod.py"
+    src.write_text("X = 1\n")
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    _compile(src)
+    assert not pyc_cache.exists()
+
+    # an entry written earlier is still read
+    monkeypatch.setattr(sys, "dont_write_bytecode", False)
+    htmx_app._compile_module.cache_clear()
+    _compile(src)
+    entry, = pyc_cache.iterdir()
+    entry.write_bytes(marshal.dumps(compile("X = 99\n", str(src), "exec")))
+    monkeypatch.setattr(sys, "dont_write_bytecode", True)
+    htmx_app._compile_module.cache_clear()
+    namespace = {}
+    exec(_compile(src), namespace)
+    assert namespace["X"] == 99
@@ -0,0 +1,96 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from htmlnojs import polling
+from htmlnojs.polling import http_get, poll_until
+
+
+@pytest.mark.asyncio
+async def test_poll_until_returns_once_probe_succeeds():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        return len(calls) == 3
+
+    assert await poll_until(probe, deadline=time.monotonic() + 5, initial=0.001)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_poll_until_gives_up_at_deadline():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        return False
+
+    start = time.monotonic()
+    assert not await poll_until(probe, deadline=start + 0.1, initial=0.01)
+    assert time.monotonic() - start < 1
+    assert len(calls) >= 2
+
+
+@pytest.mark.asyncio
+async def test_poll_until_probes_once_past_deadline():
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        return True
+
+    assert await poll_until(probe, deadline=time.monotonic() - 1)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_poll_until_backoff_grows_to_cap(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    async def probe():
+        return len(sleeps) == 5
+
+    monkeypatch.setattr(polling.asyncio, "sleep", fake_sleep)
+    await poll_until(probe, deadline=time.monotonic() + 60, initial=0.1, multiplier=2, max_interval=0.5, jitter=0)
+    assert sleeps == pytest.approx([0.1, 0.2, 0.4, 0.5, 0.5])
+
+
+async def _serve(reply: bytes):
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(reply)
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_http_get_returns_status_and_body():
+    server, port = await _serve(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n\r\n{\"status\":\"ok\"}")
+    async with server:
+        assert await http_get("127.0.0.1", port, "/health") == (200, b'{"status":"ok"}')
+
+
+@pytest.mark.asyncio
+async def test_http_get_rejects_malformed_reply():
+    server, port = await _serve(b"garbage")
+    async with server:
+        with pytest.raises(ValueError):
+            await http_get("127.0.0.1", port, "/health")
+
+
+@pytest.mark.asyncio
+async def test_http_get_unreachable_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    with pytest.raises(OSError):
+        await http_get("127.0.0.1", port, "/health", timeout=1.0)
@@ -0,0 +1,54 @@
+from htmlnojs.port_manager import PortManager
+
+
+def _free_pair():
+    return PortManager.find_available_pair(20000)
+
+
+def test_scan_reports_ports_in_order_across_windows():
+    first, _ = _free_pair()
+    held = PortManager.reserve_port(first + 5)
+    try:
+        results = list(PortManager._scan(first, first + 40, 2))
+        assert [port for port, _ in results] == list(range(first, first + 40))
+        assert dict(results)[first + 5] is False
+    finally:
+        held.close()
+
+
+def test_find_available_pair_is_consecutive_and_free():
+    first, second = _free_pair()
+    assert second == first + 1
+    assert PortManager.is_port_available(first)
+    assert PortManager.is_port_available(second)
+
+
+def test_find_available_pair_skips_held_port():
+    first, _ = _free_pair()
+    held = PortManager.reserve_port(first)
+    try:
+        assert PortManager.find_available_pair(first)[0] > first
+    finally:
+        held.close()
+
+
+def test_reserve_port_taken_returns_none():
+    first, _ = _free_pair()
+    held = PortManager.reserve_port(first)
+    try:
+        assert PortManager.reserve_port(first) is None
+    finally:
+        held.close()
+
+
+def test_reserve_port_pair_holds_listening_sockets():
+    (first, first_sock), (second, second_sock) = PortManager.reserve_port_pair(20000)
+    try:
+        assert second == first + 1
+        assert first_sock.getsockname()[1] == first
+        assert second_sock.getsockname()[1] == second
+        assert not PortManager.is_port_available(first)
+        assert not PortManager.is_port_available(second)
+    finally:
+        first_sock.close()
+        second_sock.close()